@@ -0,0 +1 @@
+"""Validators generated by compile_schemas.py. Do not edit."""
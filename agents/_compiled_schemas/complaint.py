@@ -0,0 +1,51 @@
+"""Validator for the complaint schema, generated by compile_schemas.py. Do not edit."""
+
+SCHEMA_HASH = '593cf6d25c08b9b1fa69a4bc6664efa30a3c7a42fb7e5015f51d2f217c1bcfa7'
+
+VERSION = "2.19.1"
+from decimal import Decimal
+from fastjsonschema import JsonSchemaValueException
+
+
+NoneType = type(None)
+
+def validate(data, custom_formats={}, name_prefix=None):
+    if not isinstance(data, (dict)):
+        raise JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'type': 'object', 'required': ['type', 'customer_id', 'message'], 'properties': {'type': {'type': 'string'}, 'customer_id': {'type': 'string'}, 'message': {'type': 'string'}, 'severity': {'type': 'string'}, 'category': {'type': 'string'}, 'date': {'type': 'string'}}}, rule='type')
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data__missing_keys = set(['type', 'customer_id', 'message']) - data.keys()
+        if data__missing_keys:
+            raise JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'type': 'object', 'required': ['type', 'customer_id', 'message'], 'properties': {'type': {'type': 'string'}, 'customer_id': {'type': 'string'}, 'message': {'type': 'string'}, 'severity': {'type': 'string'}, 'category': {'type': 'string'}, 'date': {'type': 'string'}}}, rule='required')
+        data_keys = set(data.keys())
+        if "type" in data_keys:
+            data_keys.remove("type")
+            data__type = data["type"]
+            if not isinstance(data__type, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".type must be string", value=data__type, name="" + (name_prefix or "data") + ".type", definition={'type': 'string'}, rule='type')
+        if "customer_id" in data_keys:
+            data_keys.remove("customer_id")
+            data__customerid = data["customer_id"]
+            if not isinstance(data__customerid, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".customer_id must be string", value=data__customerid, name="" + (name_prefix or "data") + ".customer_id", definition={'type': 'string'}, rule='type')
+        if "message" in data_keys:
+            data_keys.remove("message")
+            data__message = data["message"]
+            if not isinstance(data__message, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".message must be string", value=data__message, name="" + (name_prefix or "data") + ".message", definition={'type': 'string'}, rule='type')
+        if "severity" in data_keys:
+            data_keys.remove("severity")
+            data__severity = data["severity"]
+            if not isinstance(data__severity, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".severity must be string", value=data__severity, name="" + (name_prefix or "data") + ".severity", definition={'type': 'string'}, rule='type')
+        if "category" in data_keys:
+            data_keys.remove("category")
+            data__category = data["category"]
+            if not isinstance(data__category, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".category must be string", value=data__category, name="" + (name_prefix or "data") + ".category", definition={'type': 'string'}, rule='type')
+        if "date" in data_keys:
+            data_keys.remove("date")
+            data__date = data["date"]
+            if not isinstance(data__date, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".date must be string", value=data__date, name="" + (name_prefix or "data") + ".date", definition={'type': 'string'}, rule='type')
+    return data
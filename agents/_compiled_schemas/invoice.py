@@ -0,0 +1,61 @@
+"""Validator for the invoice schema, generated by compile_schemas.py. Do not edit."""
+
+SCHEMA_HASH = '80339898377222a5a5a54ba71bfbe62fb8d23ee3f7ff6f1aa0a731444ec0eaeb'
+
+VERSION = "2.19.1"
+from decimal import Decimal
+from fastjsonschema import JsonSchemaValueException
+
+
+NoneType = type(None)
+
+def validate(data, custom_formats={}, name_prefix=None):
+    if not isinstance(data, (dict)):
+        raise JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'type': 'object', 'required': ['invoice_number', 'date', 'total_amount'], 'properties': {'invoice_number': {'type': 'string'}, 'date': {'type': 'string'}, 'total_amount': {'type': ['number', 'string']}, 'currency': {'type': 'string'}, 'vendor': {'type': 'object'}, 'customer': {'type': 'object'}, 'items': {'type': 'array'}, 'payment_terms': {'type': 'string'}}}, rule='type')
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data__missing_keys = set(['invoice_number', 'date', 'total_amount']) - data.keys()
+        if data__missing_keys:
+            raise JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'type': 'object', 'required': ['invoice_number', 'date', 'total_amount'], 'properties': {'invoice_number': {'type': 'string'}, 'date': {'type': 'string'}, 'total_amount': {'type': ['number', 'string']}, 'currency': {'type': 'string'}, 'vendor': {'type': 'object'}, 'customer': {'type': 'object'}, 'items': {'type': 'array'}, 'payment_terms': {'type': 'string'}}}, rule='required')
+        data_keys = set(data.keys())
+        if "invoice_number" in data_keys:
+            data_keys.remove("invoice_number")
+            data__invoicenumber = data["invoice_number"]
+            if not isinstance(data__invoicenumber, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".invoice_number must be string", value=data__invoicenumber, name="" + (name_prefix or "data") + ".invoice_number", definition={'type': 'string'}, rule='type')
+        if "date" in data_keys:
+            data_keys.remove("date")
+            data__date = data["date"]
+            if not isinstance(data__date, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".date must be string", value=data__date, name="" + (name_prefix or "data") + ".date", definition={'type': 'string'}, rule='type')
+        if "total_amount" in data_keys:
+            data_keys.remove("total_amount")
+            data__totalamount = data["total_amount"]
+            if not isinstance(data__totalamount, (int, float, Decimal, str)) or isinstance(data__totalamount, bool):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".total_amount must be number or string", value=data__totalamount, name="" + (name_prefix or "data") + ".total_amount", definition={'type': ['number', 'string']}, rule='type')
+        if "currency" in data_keys:
+            data_keys.remove("currency")
+            data__currency = data["currency"]
+            if not isinstance(data__currency, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".currency must be string", value=data__currency, name="" + (name_prefix or "data") + ".currency", definition={'type': 'string'}, rule='type')
+        if "vendor" in data_keys:
+            data_keys.remove("vendor")
+            data__vendor = data["vendor"]
+            if not isinstance(data__vendor, (dict)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".vendor must be object", value=data__vendor, name="" + (name_prefix or "data") + ".vendor", definition={'type': 'object'}, rule='type')
+        if "customer" in data_keys:
+            data_keys.remove("customer")
+            data__customer = data["customer"]
+            if not isinstance(data__customer, (dict)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".customer must be object", value=data__customer, name="" + (name_prefix or "data") + ".customer", definition={'type': 'object'}, rule='type')
+        if "items" in data_keys:
+            data_keys.remove("items")
+            data__items = data["items"]
+            if not isinstance(data__items, (list, tuple)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".items must be array", value=data__items, name="" + (name_prefix or "data") + ".items", definition={'type': 'array'}, rule='type')
+        if "payment_terms" in data_keys:
+            data_keys.remove("payment_terms")
+            data__paymentterms = data["payment_terms"]
+            if not isinstance(data__paymentterms, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".payment_terms must be string", value=data__paymentterms, name="" + (name_prefix or "data") + ".payment_terms", definition={'type': 'string'}, rule='type')
+    return data
@@ -0,0 +1,78 @@
+"""Validator for the rfq schema, generated by compile_schemas.py. Do not edit."""
+
+SCHEMA_HASH = '1b3da9d1caafd41f3236c120b6bdaec398f390440894439c863afbb3e109896c'
+
+VERSION = "2.19.1"
+from decimal import Decimal
+from fastjsonschema import JsonSchemaValueException
+
+
+NoneType = type(None)
+
+def validate(data, custom_formats={}, name_prefix=None):
+    if not isinstance(data, (dict)):
+        raise JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'type': 'object', 'required': ['rfq_number', 'date', 'items'], 'properties': {'rfq_number': {'type': 'string'}, 'date': {'type': 'string'}, 'customer': {'type': 'object'}, 'items': {'type': 'array', 'items': {'type': 'object', 'required': ['description', 'quantity'], 'properties': {'description': {'type': 'string'}, 'quantity': {'type': ['number', 'string']}, 'unit': {'type': 'string'}}}}, 'delivery_date': {'type': 'string'}, 'contact_person': {'type': 'string'}}}, rule='type')
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data__missing_keys = set(['rfq_number', 'date', 'items']) - data.keys()
+        if data__missing_keys:
+            raise JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'type': 'object', 'required': ['rfq_number', 'date', 'items'], 'properties': {'rfq_number': {'type': 'string'}, 'date': {'type': 'string'}, 'customer': {'type': 'object'}, 'items': {'type': 'array', 'items': {'type': 'object', 'required': ['description', 'quantity'], 'properties': {'description': {'type': 'string'}, 'quantity': {'type': ['number', 'string']}, 'unit': {'type': 'string'}}}}, 'delivery_date': {'type': 'string'}, 'contact_person': {'type': 'string'}}}, rule='required')
+        data_keys = set(data.keys())
+        if "rfq_number" in data_keys:
+            data_keys.remove("rfq_number")
+            data__rfqnumber = data["rfq_number"]
+            if not isinstance(data__rfqnumber, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".rfq_number must be string", value=data__rfqnumber, name="" + (name_prefix or "data") + ".rfq_number", definition={'type': 'string'}, rule='type')
+        if "date" in data_keys:
+            data_keys.remove("date")
+            data__date = data["date"]
+            if not isinstance(data__date, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".date must be string", value=data__date, name="" + (name_prefix or "data") + ".date", definition={'type': 'string'}, rule='type')
+        if "customer" in data_keys:
+            data_keys.remove("customer")
+            data__customer = data["customer"]
+            if not isinstance(data__customer, (dict)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".customer must be object", value=data__customer, name="" + (name_prefix or "data") + ".customer", definition={'type': 'object'}, rule='type')
+        if "items" in data_keys:
+            data_keys.remove("items")
+            data__items = data["items"]
+            if not isinstance(data__items, (list, tuple)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".items must be array", value=data__items, name="" + (name_prefix or "data") + ".items", definition={'type': 'array', 'items': {'type': 'object', 'required': ['description', 'quantity'], 'properties': {'description': {'type': 'string'}, 'quantity': {'type': ['number', 'string']}, 'unit': {'type': 'string'}}}}, rule='type')
+            data__items_is_list = isinstance(data__items, (list, tuple))
+            if data__items_is_list:
+                data__items_len = len(data__items)
+                for data__items_x, data__items_item in enumerate(data__items):
+                    if not isinstance(data__items_item, (dict)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".items[{data__items_x}]".format(**locals()) + " must be object", value=data__items_item, name="" + (name_prefix or "data") + ".items[{data__items_x}]".format(**locals()) + "", definition={'type': 'object', 'required': ['description', 'quantity'], 'properties': {'description': {'type': 'string'}, 'quantity': {'type': ['number', 'string']}, 'unit': {'type': 'string'}}}, rule='type')
+                    data__items_item_is_dict = isinstance(data__items_item, dict)
+                    if data__items_item_is_dict:
+                        data__items_item__missing_keys = set(['description', 'quantity']) - data__items_item.keys()
+                        if data__items_item__missing_keys:
+                            raise JsonSchemaValueException("" + (name_prefix or "data") + ".items[{data__items_x}]".format(**locals()) + " must contain " + (str(sorted(data__items_item__missing_keys)) + " properties"), value=data__items_item, name="" + (name_prefix or "data") + ".items[{data__items_x}]".format(**locals()) + "", definition={'type': 'object', 'required': ['description', 'quantity'], 'properties': {'description': {'type': 'string'}, 'quantity': {'type': ['number', 'string']}, 'unit': {'type': 'string'}}}, rule='required')
+                        data__items_item_keys = set(data__items_item.keys())
+                        if "description" in data__items_item_keys:
+                            data__items_item_keys.remove("description")
+                            data__items_item__description = data__items_item["description"]
+                            if not isinstance(data__items_item__description, (str)):
+                                raise JsonSchemaValueException("" + (name_prefix or "data") + ".items[{data__items_x}].description".format(**locals()) + " must be string", value=data__items_item__description, name="" + (name_prefix or "data") + ".items[{data__items_x}].description".format(**locals()) + "", definition={'type': 'string'}, rule='type')
+                        if "quantity" in data__items_item_keys:
+                            data__items_item_keys.remove("quantity")
+                            data__items_item__quantity = data__items_item["quantity"]
+                            if not isinstance(data__items_item__quantity, (int, float, Decimal, str)) or isinstance(data__items_item__quantity, bool):
+                                raise JsonSchemaValueException("" + (name_prefix or "data") + ".items[{data__items_x}].quantity".format(**locals()) + " must be number or string", value=data__items_item__quantity, name="" + (name_prefix or "data") + ".items[{data__items_x}].quantity".format(**locals()) + "", definition={'type': ['number', 'string']}, rule='type')
+                        if "unit" in data__items_item_keys:
+                            data__items_item_keys.remove("unit")
+                            data__items_item__unit = data__items_item["unit"]
+                            if not isinstance(data__items_item__unit, (str)):
+                                raise JsonSchemaValueException("" + (name_prefix or "data") + ".items[{data__items_x}].unit".format(**locals()) + " must be string", value=data__items_item__unit, name="" + (name_prefix or "data") + ".items[{data__items_x}].unit".format(**locals()) + "", definition={'type': 'string'}, rule='type')
+        if "delivery_date" in data_keys:
+            data_keys.remove("delivery_date")
+            data__deliverydate = data["delivery_date"]
+            if not isinstance(data__deliverydate, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".delivery_date must be string", value=data__deliverydate, name="" + (name_prefix or "data") + ".delivery_date", definition={'type': 'string'}, rule='type')
+        if "contact_person" in data_keys:
+            data_keys.remove("contact_person")
+            data__contactperson = data["contact_person"]
+            if not isinstance(data__contactperson, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".contact_person must be string", value=data__contactperson, name="" + (name_prefix or "data") + ".contact_person", definition={'type': 'string'}, rule='type')
+    return data
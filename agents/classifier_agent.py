@@ -5,7 +5,13 @@ Responsible for detecting document format and intent, then routing to appropriat
 
 import os
 import sys
-from typing import Dict, Any, Tuple, Optional
+import copy
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Tuple, Optional
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -14,6 +20,69 @@ from utils.parser_utils import detect_file_format, extract_text_from_pdf, parse_
 from utils.intent_detection import detect_intent_from_text, detect_intent_from_json, detect_intent_from_email
 from memory.shared_memory import SharedMemory
 
+# PDF text beyond this many characters adds nothing to intent detection
+_PDF_TEXT_LIMIT = 200_000
+
+@functools.lru_cache(maxsize=256)
+def _classify_file(file_path: str, mtime_ns: int, size: int) -> Tuple[str, Optional[str], float, Any]:
+    """
+    Detect format, parse content and detect intent for a file
+    
+    The modification time and size are only part of the cache key, so an
+    unchanged file is never re-parsed while an edited one always is.
+    
+    Returns:
+        tuple: (format_type, intent, confidence, content)
+    """
+    format_type = detect_file_format(file_path)
+    
+    if format_type == 'pdf':
+        text_content = extract_text_from_pdf(file_path, max_chars=_PDF_TEXT_LIMIT)
+        intent, confidence = detect_intent_from_text(text_content)
+        return format_type, intent, confidence, {'text': text_content}
+    elif format_type == 'json':
+        json_content = parse_json_file(file_path)
+        intent, confidence = detect_intent_from_json(json_content)
+        return format_type, intent, confidence, json_content
+    elif format_type == 'email':
+        email_content = parse_email(file_path)
+        intent, confidence = detect_intent_from_email(
+            email_content.get('subject', ''), 
+            email_content.get('body', '')
+        )
+        return format_type, intent, confidence, email_content
+    
+    return format_type, None, 0.0, None
+
+def _classify_path(file_path: str) -> Tuple[str, Optional[str], float, Any]:
+    """Classify a file by path, keyed on its current modification time and size"""
+    stat = os.stat(file_path)
+    format_type, intent, confidence, content = _classify_file(file_path, stat.st_mtime_ns, stat.st_size)
+    
+    # Hand out a copy of the content so callers cannot modify the cached result
+    return format_type, intent, confidence, copy.deepcopy(content)
+
+def _content_sample(content: Any, limit: int = 200) -> str:
+    """
+    Return the first `limit` characters of str(content) without stringifying
+    all of it (PDF text and large JSON documents can run to megabytes)
+    """
+    if isinstance(content, str):
+        return content[:limit]
+    if not isinstance(content, dict):
+        return str(content)[:limit]
+    
+    sample = '{'
+    for index, (key, value) in enumerate(content.items()):
+        # Long strings only need enough characters to fill the sample
+        if isinstance(value, str) and len(value) > limit:
+            value = value[:limit + 1]
+        sample += f"{', ' if index else ''}{key!r}: {value!r}"
+        if len(sample) >= limit:
+            return sample[:limit]
+    
+    return (sample + '}')[:limit]
+
 class ClassifierAgent:
     """
     Agent responsible for classifying document format and intent,
@@ -40,9 +109,17 @@ class ClassifierAgent:
         Returns:
             dict: Processing result with format, intent, and routing info
         """
-        # Detect file format
-        format_type = detect_file_format(file_path)
+        # Detect format, content and intent (cached for unchanged files)
+        return self._route(file_path, *_classify_path(file_path))
+    
+    def _route(self, file_path: str, format_type: str, intent: Optional[str],
+               confidence: float, content: Any) -> Dict[str, Any]:
+        """
+        Record a classified file in memory and choose its target agent
         
+        Returns:
+            dict: Processing result with format, intent, and routing info
+        """
         if format_type not in self.supported_formats:
             return {
                 'status': 'error',
@@ -50,37 +127,19 @@ class ClassifierAgent:
                 'format': format_type
             }
         
-        # Extract content based on format
-        content = None
-        if format_type == 'pdf':
-            text_content = extract_text_from_pdf(file_path)
-            intent, confidence = detect_intent_from_text(text_content)
-            content = {'text': text_content}
-        elif format_type == 'json':
-            json_content = parse_json_file(file_path)
-            intent, confidence = detect_intent_from_json(json_content)
-            content = json_content
-        elif format_type == 'email':
-            email_content = parse_email(file_path)
-            intent, confidence = detect_intent_from_email(
-                email_content.get('subject', ''), 
-                email_content.get('body', '')
-            )
-            content = email_content
-        
-        # Create memory thread
+        # Create memory thread, recording the classification result with it
+        timestamp = datetime.now().isoformat()
         thread_id = self.memory.create_thread(
             input_source=file_path,
             format_type=format_type,
-            intent=intent
+            intent=intent,
+            timestamp=timestamp,
+            metadata={
+                'confidence': confidence,
+                'content_sample': _content_sample(content) if content else None  # Store a sample of content
+            }
         )
         
-        # Log classification result
-        self.memory.update_metadata(thread_id, {
-            'confidence': confidence,
-            'content_sample': str(content)[:200] if content else None  # Store a sample of content
-        })
-        
         # Determine target agent based on format
         target_agent = 'json_agent' if format_type == 'json' else 'email_agent'
         
@@ -99,6 +158,46 @@ class ClassifierAgent:
             'format': format_type,
             'intent': intent,
             'confidence': confidence,
+            'timestamp': timestamp,
             'target_agent': target_agent,
             'content': content
         }
+    
+    async def process_batch(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify several input files concurrently
+        
+        Each file is processed in a worker thread so disk reads and parsing
+        overlap across files.
+        
+        Args:
+            file_paths: Paths to the input files
+            
+        Returns:
+            list: Processing results in the same order as file_paths
+        """
+        tasks = [asyncio.to_thread(self.process, file_path) for file_path in file_paths]
+        return await asyncio.gather(*tasks)
+    
+    def process_many(self, file_paths: List[str], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Classify several input files in parallel worker processes
+        
+        Parsing and intent detection run in the workers; memory threads and
+        routing logs are still written from this process.
+        
+        Args:
+            file_paths: Paths to the input files
+            workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            list: Processing results in the same order as file_paths
+        """
+        # Workers are spawned rather than forked, since callers run threads
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            classifications = list(executor.map(_classify_path, file_paths))
+        
+        return [
+            self._route(file_path, *classification)
+            for file_path, classification in zip(file_paths, classifications)
+        ]
@@ -6,7 +6,7 @@ Responsible for processing email documents and extracting structured information
 import os
 import sys
 import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 # Add parent directory to path for imports
@@ -14,6 +14,70 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from memory.shared_memory import SharedMemory
 
+# Optional: google-re2 gives linear-time matching with no catastrophic backtracking
+try:
+    import re2 as _fast_re
+except ImportError:
+    _fast_re = re
+
+# Optional: Aho-Corasick automaton for urgency keyword scanning
+try:
+    import ahocorasick
+    AHOCORASICK_SUPPORT = True
+except ImportError:
+    AHOCORASICK_SUPPORT = False
+
+# Precompiled patterns shared by all EmailAgent instances
+# Keywords indicating high / medium urgency
+_HIGH_URGENCY_KEYWORDS = ['urgent', 'asap', 'emergency', 'immediate', 'critical', 'important']
+_MEDIUM_URGENCY_KEYWORDS = ['soon', 'timely', 'attention', 'priority', 'please respond']
+
+# Regex fallback used when pyahocorasick is not installed
+_HIGH_URGENCY_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, _HIGH_URGENCY_KEYWORDS)) + r')\b', re.IGNORECASE
+)
+_MEDIUM_URGENCY_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, _MEDIUM_URGENCY_KEYWORDS)) + r')\b', re.IGNORECASE
+)
+
+def _build_urgency_automaton():
+    """Build an Aho-Corasick automaton mapping each urgency keyword to its level"""
+    automaton = ahocorasick.Automaton()
+    for keyword in _MEDIUM_URGENCY_KEYWORDS:
+        automaton.add_word(keyword, (len(keyword), 'medium'))
+    for keyword in _HIGH_URGENCY_KEYWORDS:
+        automaton.add_word(keyword, (len(keyword), 'high'))
+    automaton.make_automaton()
+    return automaton
+
+_URGENCY_AUTOMATON = _build_urgency_automaton() if AHOCORASICK_SUPPORT else None
+
+def _is_word_char(char: str) -> bool:
+    """Match the regex definition of a word character used by \\b"""
+    return char.isalnum() or char == '_'
+
+# Contact patterns, kept to the RE2-compatible subset (no possessive
+# quantifiers): RE2 never backtracks, and under re the \b fences stop them
+# from extending greedily
+_EMAIL_RE = _fast_re.compile(r'\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b')
+_PHONE_RE = _fast_re.compile(r'\b(?:\+\d{1,3}[-\s]?)?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}\b')
+
+# Date and currency patterns. Each one is scanned separately, since their
+# matches can overlap ("$1,000.00 USD" holds two amounts) and in a single
+# alternation one match would consume the text of another
+_DATE_PATTERNS = tuple(_fast_re.compile(pattern) for pattern in (
+    r'(?i)\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',  # MM/DD/YYYY or DD/MM/YYYY
+    r'(?i)\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2}(?:st|nd|rd|th)?,? \d{4}\b',  # Month DD, YYYY
+    r'(?i)\b\d{1,2}(?:st|nd|rd|th)? (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}\b'  # DD Month YYYY
+))
+_AMOUNT_PATTERNS = tuple(_fast_re.compile(pattern) for pattern in (
+    r'(?i)\$\s?\d+(?:,\d{3})*(?:\.\d{2})?',  # $1,000.00
+    r'(?i)\d+(?:,\d{3})*(?:\.\d{2})?\s?(?:dollars|USD|EUR|GBP)',  # 1,000.00 dollars
+    r'(?i)(?:USD|EUR|GBP)\s?\d+(?:,\d{3})*(?:\.\d{2})?'  # USD 1,000.00
+))
+
+_NON_NUMERIC_RE = re.compile(r'[^\d.]')
+
 class EmailAgent:
     """
     Agent responsible for processing email documents,
@@ -29,13 +93,16 @@ class EmailAgent:
         """
         self.memory = memory
     
-    def process(self, thread_id: str, email_content: Dict[str, Any]) -> Dict[str, Any]:
+    def process(self, thread_id: str, email_content: Dict[str, Any],
+                intent: Optional[str] = None, received_date: Optional[str] = None) -> Dict[str, Any]:
         """
         Process an email document
         
         Args:
             thread_id: The thread ID from the classifier agent
-            email_content: Parsed email content
+            email_content: Email content already parsed by the classifier (the file is not reopened)
+            intent: Intent detected by the classifier (looked up in memory if omitted)
+            received_date: Thread creation time (looked up in memory if omitted)
             
         Returns:
             dict: Processing result with extracted information
@@ -49,43 +116,46 @@ class EmailAgent:
         body = email_content.get('body', '')
         date = email_content.get('date', '')
         
-        # Store extracted fields in memory
-        self.memory.store_extracted_field(thread_id, 'sender', sender)
-        self.memory.store_extracted_field(thread_id, 'subject', subject)
-        self.memory.store_extracted_field(thread_id, 'date', date)
+        # Collect extracted fields locally and store them in one batch
+        fields = {'sender': sender, 'subject': subject, 'date': date}
         
         # Extract email domain from sender
         sender_domain = self._extract_domain(sender)
         if sender_domain:
-            self.memory.store_extracted_field(thread_id, 'sender_domain', sender_domain)
+            fields['sender_domain'] = sender_domain
         
         # Determine urgency based on subject and content
         urgency = self._determine_urgency(subject, body)
-        self.memory.store_extracted_field(thread_id, 'urgency', urgency)
+        fields['urgency'] = urgency
         
-        # Extract any mentioned contacts
-        contacts = self._extract_contacts(body)
+        # Extract mentioned contacts, dates and amounts
+        contacts, dates, amounts = self._scan_body(body)
         if contacts:
-            self.memory.store_extracted_field(thread_id, 'mentioned_contacts', contacts)
+            fields['mentioned_contacts'] = contacts
         
-        # Extract any dates mentioned
-        dates = self._extract_dates(body)
         if dates:
-            self.memory.store_extracted_field(thread_id, 'mentioned_dates', dates)
+            fields['mentioned_dates'] = dates
         
-        # Extract any amounts/numbers
-        amounts = self._extract_amounts(body)
         if amounts:
-            self.memory.store_extracted_field(thread_id, 'mentioned_amounts', amounts)
+            fields['mentioned_amounts'] = amounts
+        
+        # Fall back to memory only when the classifier context was not passed in
+        if intent is None or received_date is None:
+            thread_info = self.memory.get_thread_info(thread_id)
+            if intent is None:
+                intent = thread_info.get('intent', 'unknown')
+            if received_date is None:
+                received_date = thread_info.get('timestamp', '')
         
         # Create normalized CRM-friendly output
         crm_output = self._normalize_to_crm(
-            thread_id, sender, subject, body, urgency, 
-            sender_domain, contacts, dates, amounts
+            sender, subject, body, urgency, sender_domain,
+            contacts, dates, amounts, intent, received_date
         )
+        fields['crm_normalized'] = crm_output
         
-        # Store the normalized output
-        self.memory.store_extracted_field(thread_id, 'crm_normalized', crm_output)
+        # Store all extracted fields in memory
+        self.memory.store_extracted_fields(thread_id, fields)
         
         # Update status to completed
         self.memory.update_status(thread_id, "completed")
@@ -107,10 +177,10 @@ class EmailAgent:
         }
     
     def _extract_domain(self, email_address: str) -> Optional[str]:
-        """Extract domain from email address"""
-        match = re.search(r'@([^@]+)$', email_address)
-        if match:
-            return match.group(1)
+        """Extract domain from email address (everything after the last '@')"""
+        _, separator, domain = email_address.rpartition('@')
+        if separator and domain:
+            return domain
         return None
     
     def _determine_urgency(self, subject: str, body: str) -> str:
@@ -120,88 +190,63 @@ class EmailAgent:
         Returns:
             str: 'high', 'medium', or 'low'
         """
-        # Keywords indicating high urgency
-        high_urgency = ['urgent', 'asap', 'emergency', 'immediate', 'critical', 'important']
+        combined_text = subject + " " + body
         
-        # Keywords indicating medium urgency
-        medium_urgency = ['soon', 'timely', 'attention', 'priority', 'please respond']
+        if _URGENCY_AUTOMATON is not None:
+            return self._determine_urgency_automaton(combined_text.lower())
         
-        # Check for high urgency keywords
-        combined_text = (subject + " " + body).lower()
-        for keyword in high_urgency:
-            if re.search(r'\b' + re.escape(keyword) + r'\b', combined_text):
-                return 'high'
+        if _HIGH_URGENCY_RE.search(combined_text):
+            return 'high'
         
-        # Check for medium urgency keywords
-        for keyword in medium_urgency:
-            if re.search(r'\b' + re.escape(keyword) + r'\b', combined_text):
-                return 'medium'
+        if _MEDIUM_URGENCY_RE.search(combined_text):
+            return 'medium'
         
         # Default to low urgency
         return 'low'
     
-    def _extract_contacts(self, text: str) -> List[str]:
-        """Extract potential contact information from text"""
-        contacts = []
+    def _determine_urgency_automaton(self, text: str) -> str:
+        """Scan lowercased text once with the urgency automaton, honouring word boundaries"""
+        urgency = 'low'
+        last_index = len(text) - 1
+        
+        for end_index, (length, level) in _URGENCY_AUTOMATON.iter(text):
+            start_index = end_index - length + 1
+            if start_index > 0 and _is_word_char(text[start_index - 1]):
+                continue
+            if end_index < last_index and _is_word_char(text[end_index + 1]):
+                continue
+            
+            if level == 'high':
+                return 'high'
+            urgency = 'medium'
         
-        # Extract email addresses
-        emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', text)
-        contacts.extend(emails)
+        return urgency
+    
+    def _scan_body(self, text: str) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Extract contacts, dates and monetary amounts from text
         
-        # Extract phone numbers (simple pattern)
-        phones = re.findall(r'\b(?:\+\d{1,3}[-\s]?)?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}\b', text)
-        contacts.extend(phones)
+        Returns:
+            tuple: (contacts, dates, amounts), grouped by pattern in the order above
+        """
+        # Email addresses first, then phone numbers
+        contacts = _EMAIL_RE.findall(text) + _PHONE_RE.findall(text)
+        dates = [date for pattern in _DATE_PATTERNS for date in pattern.findall(text)]
+        amounts = [amount for pattern in _AMOUNT_PATTERNS for amount in pattern.findall(text)]
         
-        return contacts
-    
-    def _extract_dates(self, text: str) -> List[str]:
-        """Extract dates mentioned in the text"""
-        dates = []
-        
-        # Common date patterns
-        date_patterns = [
-            r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',  # MM/DD/YYYY or DD/MM/YYYY
-            r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2}(?:st|nd|rd|th)?,? \d{4}\b',  # Month DD, YYYY
-            r'\b\d{1,2}(?:st|nd|rd|th)? (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}\b'  # DD Month YYYY
-        ]
-        
-        for pattern in date_patterns:
-            found_dates = re.findall(pattern, text, re.IGNORECASE)
-            dates.extend(found_dates)
-        
-        return dates
+        return contacts, dates, amounts
     
-    def _extract_amounts(self, text: str) -> List[str]:
-        """Extract monetary amounts or numbers from text"""
-        amounts = []
-        
-        # Currency patterns
-        currency_patterns = [
-            r'\$\s?\d+(?:,\d{3})*(?:\.\d{2})?',  # $1,000.00
-            r'\d+(?:,\d{3})*(?:\.\d{2})?\s?(?:dollars|USD|EUR|GBP)',  # 1,000.00 dollars
-            r'(?:USD|EUR|GBP)\s?\d+(?:,\d{3})*(?:\.\d{2})?'  # USD 1,000.00
-        ]
-        
-        for pattern in currency_patterns:
-            found_amounts = re.findall(pattern, text, re.IGNORECASE)
-            amounts.extend(found_amounts)
-        
-        return amounts
-    
-    def _normalize_to_crm(self, thread_id: str, sender: str, subject: str, 
+    def _normalize_to_crm(self, sender: str, subject: str, 
                          body: str, urgency: str, sender_domain: Optional[str],
                          contacts: List[str], dates: List[str], 
-                         amounts: List[str]) -> Dict[str, Any]:
+                         amounts: List[str], intent: str,
+                         received_date: str) -> Dict[str, Any]:
         """
         Normalize extracted information to a CRM-friendly format
         
         Returns:
             dict: Normalized CRM data
         """
-        # Get thread info from memory
-        thread_info = self.memory.get_thread_info(thread_id)
-        intent = thread_info.get('intent', 'unknown')
-        
         # Create normalized output
         crm_data = {
             'contact': {
@@ -215,7 +260,7 @@ class EmailAgent:
                 'subject': subject,
                 'urgency': urgency,
                 'category': intent,
-                'received_date': thread_info.get('timestamp', ''),
+                'received_date': received_date,
                 'mentioned_dates': dates
             },
             'business': {
@@ -241,7 +286,7 @@ class EmailAgent:
         values = []
         for amount in amounts:
             # Remove currency symbols and commas
-            cleaned = re.sub(r'[^\d.]', '', amount)
+            cleaned = _NON_NUMERIC_RE.sub('', amount)
             try:
                 values.append(float(cleaned))
             except ValueError:
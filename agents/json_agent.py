@@ -5,14 +5,76 @@ Responsible for processing JSON documents, validating against schemas, and extra
 
 import os
 import sys
+import copy
 import json
+import hashlib
+import importlib
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Set, Tuple
 from jsonschema import validate, ValidationError, Draft7Validator
 
+# Optional: code-generated validators for the common (valid document) path
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_SUPPORT = True
+except ImportError:
+    FASTJSONSCHEMA_SUPPORT = False
+
+# Package holding validators generated ahead of time by compile_schemas.py
+COMPILED_SCHEMAS_PACKAGE = 'agents._compiled_schemas'
+
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from memory.shared_memory import SharedMemory
+from utils.parser_utils import json_loads, canonical_json
+
+# JSON schema type names keyed on the exact Python type produced by JSON parsing
+# (bool is looked up by its own type, so it is never reported as a number)
+_TYPE_MAP = {
+    type(None): 'null',
+    bool: 'boolean',
+    int: 'number',
+    float: 'number',
+    str: 'string',
+    list: 'array',
+    dict: 'object'
+}
+
+# Bit per JSON schema type name, so a property's allowed types fold into one mask
+_TYPE_BIT = {
+    'null': 1,
+    'boolean': 2,
+    'number': 4,
+    'string': 8,
+    'array': 16,
+    'object': 32,
+    'integer': 64
+}
+
+# Analysis results kept per agent, and the largest canonical document cached
+_ANALYSIS_CACHE_SIZE = 512
+_ANALYSIS_CACHE_MAX_BYTES = 64 * 1024
+
+# Bit for the exact Python type of a value (0 for types JSON cannot produce)
+_VALUE_TYPE_BIT = {value_type: _TYPE_BIT[name] for value_type, name in _TYPE_MAP.items()}
+
+def schema_fingerprint(schema: Dict[str, Any]) -> str:
+    """Stable hash of a schema, used to detect stale precompiled validators"""
+    canonical = json.dumps(schema, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def _sum_amounts(items: List[Any]) -> Any:
+    """Sum the 'amount' of every dict item that has one, skipping the rest"""
+    total = 0
+    for item in items:
+        try:
+            amount = item['amount']
+        except (TypeError, KeyError):
+            continue
+        total += amount
+    return total
 
 class JSONAgent:
     """
@@ -31,6 +93,13 @@ class JSONAgent:
         self.memory = memory
         self.schemas_dir = schemas_dir
         self.schemas = {}
+        self._validators = {}
+        self._compiled = {}
+        self._quality_checks = {}
+        
+        # Analysis results keyed on (intent, canonical JSON digest), for re-sent documents
+        self._analysis_cache = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()
         
         # Load schemas if directory is provided
         if schemas_dir and os.path.isdir(schemas_dir):
@@ -38,6 +107,9 @@ class JSONAgent:
         else:
             # Default schemas for common document types
             self._initialize_default_schemas()
+        
+        # Build validators once per schema rather than per document
+        self._compile_schemas()
     
     def _load_schemas(self):
         """Load JSON schemas from schemas directory"""
@@ -47,11 +119,84 @@ class JSONAgent:
                 schema_path = os.path.join(self.schemas_dir, filename)
                 
                 try:
-                    with open(schema_path, 'r') as f:
-                        self.schemas[schema_name] = json.load(f)
+                    with open(schema_path, 'rb') as f:
+                        self.schemas[schema_name] = json_loads(f.read())
                 except Exception as e:
                     print(f"Error loading schema {schema_name}: {e}")
     
+    def _compile_schemas(self):
+        """Build and cache the validators and quality-check lookups for every loaded schema"""
+        for schema_name, schema in self.schemas.items():
+            self._validators[schema_name] = Draft7Validator(schema)
+            self._quality_checks[schema_name] = self._preprocess_schema(schema)
+            
+            if FASTJSONSCHEMA_SUPPORT:
+                compiled = self._load_precompiled(schema_name, schema)
+                if compiled is None:
+                    try:
+                        compiled = fastjsonschema.compile(schema)
+                    except Exception as e:
+                        print(f"Error compiling schema {schema_name}: {e}")
+                if compiled is not None:
+                    self._compiled[schema_name] = compiled
+    
+    def _load_precompiled(self, schema_name: str, schema: Dict[str, Any]):
+        """
+        Import the validator generated ahead of time for a schema, if any
+        
+        Returns:
+            callable or None: The validate function, or None if no generated
+                              module exists or it was built from a different schema
+        """
+        # Names like "po.v1" cannot be module names, so compile_schemas.py skips them
+        if not schema_name.isidentifier():
+            return None
+        
+        module_name = f"{COMPILED_SCHEMAS_PACKAGE}.{schema_name}"
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name != module_name:
+                raise
+            return None
+        except ImportError:
+            # e.g. generated by a fastjsonschema release other than the installed one
+            return None
+        
+        if getattr(module, 'SCHEMA_HASH', None) != schema_fingerprint(schema):
+            return None
+        
+        return module.validate
+    
+    def _preprocess_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Precompute the lookups used by the data quality check for a schema
+        
+        Returns:
+            dict: Required fields (ordered and as a frozenset) and the
+                  (field, expected_type, type_mask) triples for typed properties
+        """
+        required = tuple(schema.get('required', ()))
+        typed_properties = []
+        
+        for field, spec in schema.get('properties', {}).items():
+            if 'type' in spec:
+                expected_type = spec['type']
+                if isinstance(expected_type, list):
+                    valid_types = expected_type
+                else:
+                    valid_types = [expected_type]
+                type_mask = 0
+                for type_name in valid_types:
+                    type_mask |= _TYPE_BIT.get(type_name, 0)
+                typed_properties.append((field, expected_type, type_mask))
+        
+        return {
+            'required': required,
+            'required_set': frozenset(required),
+            'typed_properties': typed_properties
+        }
+    
     def _initialize_default_schemas(self):
         """Initialize default schemas for common document types"""
         # Invoice schema
@@ -109,13 +254,15 @@ class JSONAgent:
             }
         }
     
-    def process(self, thread_id: str, json_content: Dict[str, Any]) -> Dict[str, Any]:
+    def process(self, thread_id: str, json_content: Dict[str, Any],
+                intent: Optional[str] = None) -> Dict[str, Any]:
         """
         Process a JSON document
         
         Args:
             thread_id: The thread ID from the classifier agent
-            json_content: Parsed JSON content
+            json_content: JSON content already parsed by the classifier (the file is not reopened)
+            intent: Intent detected by the classifier (looked up in memory if omitted)
             
         Returns:
             dict: Processing result with validation status and extracted information
@@ -123,32 +270,26 @@ class JSONAgent:
         # Log start of processing
         self.memory.update_status(thread_id, "processing_json")
         
-        # Get intent from thread info
-        thread_info = self.memory.get_thread_info(thread_id)
-        intent = thread_info.get('intent', 'unknown')
-        
-        # Validate against schema if available
-        validation_result = self._validate_json(json_content, intent)
-        
-        # Store validation result
-        self.memory.store_extracted_field(thread_id, 'validation_result', validation_result)
-        
-        # Extract essential fields
-        extracted_fields = self._extract_fields(json_content, intent)
+        # Get intent from thread info unless the classifier passed it in
+        if intent is None:
+            thread_info = self.memory.get_thread_info(thread_id)
+            intent = thread_info.get('intent', 'unknown')
         
-        # Store extracted fields
-        for field_name, field_value in extracted_fields.items():
-            self.memory.store_extracted_field(thread_id, field_name, field_value)
+        # Validate, extract fields and check data quality (cached per document)
+        validation_result, extracted_fields, missing_fields, anomalous_fields = \
+            self._analyze(json_content, intent)
         
-        # Check for missing or anomalous fields
-        missing_fields, anomalous_fields = self._check_data_quality(json_content, intent)
+        # Store validation result, extracted fields and data quality issues in one batch
+        fields = {'validation_result': validation_result}
+        fields.update(extracted_fields)
         
-        # Store data quality issues
         if missing_fields:
-            self.memory.store_extracted_field(thread_id, 'missing_fields', missing_fields)
+            fields['missing_fields'] = missing_fields
         
         if anomalous_fields:
-            self.memory.store_extracted_field(thread_id, 'anomalous_fields', anomalous_fields)
+            fields['anomalous_fields'] = anomalous_fields
+        
+        self.memory.store_extracted_fields(thread_id, fields)
         
         # Update status to completed
         self.memory.update_status(thread_id, "completed")
@@ -165,6 +306,58 @@ class JSONAgent:
             }
         }
     
+    def _analyze(self, json_content: Dict[str, Any], intent: str) -> Tuple[Dict[str, Any], Dict[str, Any], List[str], List[Dict[str, Any]]]:
+        """
+        Run validation, field extraction and data quality checks on a document
+        
+        Identical documents (compared by a digest of their canonical JSON)
+        share one cached analysis; callers receive their own copy of the
+        cached result. Documents over _ANALYSIS_CACHE_MAX_BYTES are not cached.
+        
+        Returns:
+            tuple: (validation_result, extracted_fields, missing_fields, anomalous_fields)
+        """
+        try:
+            canonical = canonical_json(json_content)
+        except (TypeError, ValueError):
+            # Not serializable, so it cannot be cached
+            return self._analyze_uncached(json_content, intent)
+        
+        if len(canonical) > _ANALYSIS_CACHE_MAX_BYTES:
+            return self._analyze_uncached(json_content, intent)
+        
+        key = (intent, hashlib.blake2b(canonical, digest_size=16).digest())
+        
+        with self._analysis_cache_lock:
+            result = self._analysis_cache.get(key)
+            if result is not None:
+                self._analysis_cache.move_to_end(key)
+        if result is not None:
+            return copy.deepcopy(result)
+        
+        # The document itself is analyzed, since canonical JSON is only a key
+        result = self._analyze_uncached(json_content, intent)
+        
+        with self._analysis_cache_lock:
+            self._analysis_cache[key] = copy.deepcopy(result)
+            if len(self._analysis_cache) > _ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        
+        return result
+    
+    def _analyze_uncached(self, json_content: Dict[str, Any], intent: str) -> Tuple[Dict[str, Any], Dict[str, Any], List[str], List[Dict[str, Any]]]:
+        """Run validation, field extraction and data quality checks without caching"""
+        # Validate against schema if available
+        validation_result = self._validate_json(json_content, intent)
+        
+        # Extract essential fields
+        extracted_fields = self._extract_fields(json_content, intent)
+        
+        # Check for missing or anomalous fields
+        missing_fields, anomalous_fields = self._check_data_quality(json_content, intent)
+        
+        return validation_result, extracted_fields, missing_fields, anomalous_fields
+    
     def _validate_json(self, json_content: Dict[str, Any], intent: str) -> Dict[str, Any]:
         """
         Validate JSON against schema for the given intent
@@ -174,9 +367,21 @@ class JSONAgent:
         """
         # Check if we have a schema for this intent
         if intent in self.schemas:
-            schema = self.schemas[intent]
-            validator = Draft7Validator(schema)
-            errors = list(validator.iter_errors(json_content))
+            # Fast path: the compiled validator accepts most documents outright
+            compiled = self._compiled.get(intent)
+            if compiled is not None:
+                try:
+                    compiled(json_content)
+                    return {
+                        'valid': True,
+                        'schema': intent,
+                        'errors': []
+                    }
+                except fastjsonschema.JsonSchemaException:
+                    # Fall through to collect every error, not just the first
+                    pass
+            
+            errors = list(self._validators[intent].iter_errors(json_content))
             
             if errors:
                 # Format validation errors
@@ -215,6 +420,10 @@ class JSONAgent:
         """
         extracted = {}
         
+        # Fields are only extracted from a top-level object
+        if not isinstance(json_content, dict):
+            return extracted
+        
         # Common fields to extract for all intents
         if 'id' in json_content:
             extracted['id'] = json_content['id']
@@ -242,10 +451,7 @@ class JSONAgent:
             # Extract items count if available
             if 'items' in json_content and isinstance(json_content['items'], list):
                 extracted['items_count'] = len(json_content['items'])
-                extracted['items_total'] = sum(
-                    item.get('amount', 0) for item in json_content['items'] 
-                    if isinstance(item, dict) and 'amount' in item
-                )
+                extracted['items_total'] = _sum_amounts(json_content['items'])
         
         elif intent == 'rfq':
             # Extract RFQ-specific fields
@@ -285,51 +491,32 @@ class JSONAgent:
         anomalous_fields = []
         
         # Check against schema if available
-        if intent in self.schemas:
-            schema = self.schemas[intent]
+        checks = self._quality_checks.get(intent)
+        if checks is not None:
+            # A top-level array or scalar has none of the required fields
+            if not isinstance(json_content, dict):
+                return list(checks['required']), anomalous_fields
             
-            # Check for missing required fields
-            if 'required' in schema:
-                for field in schema['required']:
-                    if field not in json_content:
-                        missing_fields.append(field)
+            # Check for missing required fields (reported in schema order)
+            missing = checks['required_set'].difference(json_content.keys())
+            if missing:
+                missing_fields = [field for field in checks['required'] if field in missing]
             
             # Check properties for anomalies
-            if 'properties' in schema:
-                for field, spec in schema['properties'].items():
-                    if field in json_content:
-                        # Check type
-                        if 'type' in spec:
-                            expected_type = spec['type']
-                            if isinstance(expected_type, list):
-                                valid_types = expected_type
-                            else:
-                                valid_types = [expected_type]
-                            
-                            # Check if value matches any of the valid types
-                            value_type = self._get_json_type(json_content[field])
-                            if value_type not in valid_types:
-                                anomalous_fields.append({
-                                    'field': field,
-                                    'issue': f"Expected type {expected_type}, got {value_type}",
-                                    'value': str(json_content[field])
-                                })
+            for field, expected_type, type_mask in checks['typed_properties']:
+                if field in json_content:
+                    # Check if value matches any of the valid types
+                    value = json_content[field]
+                    if not _VALUE_TYPE_BIT.get(type(value), 0) & type_mask:
+                        value_type = self._get_json_type(value)
+                        anomalous_fields.append({
+                            'field': field,
+                            'issue': f"Expected type {expected_type}, got {value_type}",
+                            'value': str(value)
+                        })
         
         return missing_fields, anomalous_fields
     
     def _get_json_type(self, value: Any) -> str:
         """Get JSON schema type for a value"""
-        if value is None:
-            return 'null'
-        elif isinstance(value, bool):
-            return 'boolean'
-        elif isinstance(value, int) or isinstance(value, float):
-            return 'number'
-        elif isinstance(value, str):
-            return 'string'
-        elif isinstance(value, list):
-            return 'array'
-        elif isinstance(value, dict):
-            return 'object'
-        else:
-            return 'unknown'
+        return _TYPE_MAP.get(type(value), 'unknown')
@@ -9,11 +9,12 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 import tempfile
+import shutil
 import sqlite3
-import uuid
 
 # Import our multi-agent system
 from main import MultiAgentSystem
+from memory.shared_memory import db_version, _thread_id
 
 # Set page configuration
 st.set_page_config(
@@ -23,10 +24,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource
+def get_system():
+    """Create the multi-agent system once and share it across all sessions"""
+    return MultiAgentSystem()
+
+system = get_system()
+
 # Initialize session state
-if 'system' not in st.session_state:
-    st.session_state.system = MultiAgentSystem()
-    
 if 'processed_files' not in st.session_state:
     st.session_state.processed_files = []
     
@@ -34,45 +39,78 @@ if 'selected_thread' not in st.session_state:
     st.session_state.selected_thread = None
 
 # Helper functions
-def load_processing_results():
-    """Load processing results from the memory database"""
+DB_PATH = 'outputs/memory.db'
+
+# Results are keyed on the database version, so they never go stale and need
+# no TTL: reruns with an unchanged database return the cached rows without
+# opening it. Only the most recent versions are kept.
+@st.cache_data(max_entries=4, show_spinner=False)
+def _load_processing_results_cached(db_version):
+    """Read all threads from the memory database (cached per database version)"""
+    conn = sqlite3.connect(DB_PATH)
     try:
-        conn = sqlite3.connect('outputs/memory.db')
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Get all threads
-        cursor.execute("SELECT thread_id, input_source, timestamp, format, intent, status FROM memory")
-        rows = cursor.fetchall()
-        
-        results = []
-        for row in rows:
-            results.append(dict(row))
-            
+        # Build the DataFrame straight from the cursor
+        df = pd.read_sql_query(
+            "SELECT thread_id, input_source, display_name, timestamp, format, intent, status FROM memory",
+            conn
+        )
+    finally:
         conn.close()
-        return results
+    
+    # Thread IDs are stored as 16-byte UUID keys (legacy rows may hold text)
+    df['thread_id'] = [_thread_id(key) for key in df['thread_id']]
+    return df
+
+def load_processing_results():
+    """Load processing results from the memory database as a DataFrame"""
+    try:
+        return _load_processing_results_cached(db_version(DB_PATH))
     except Exception as e:
         st.error(f"Error loading results: {e}")
-        return []
+        return pd.DataFrame()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _get_thread_details_cached(thread_id, db_version):
+    """Read one thread from shared memory (cached per database version)"""
+    return system.memory.get_thread_info(thread_id)
 
 def get_thread_details(thread_id):
     """Get detailed information for a specific thread"""
     try:
-        return st.session_state.system.memory.get_thread_info(thread_id)
+        return _get_thread_details_cached(thread_id, db_version(DB_PATH))
     except Exception as e:
         st.error(f"Error getting thread details: {e}")
         return {}
 
+LOG_PATH = 'outputs/processing.log'
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _tail_log(path, mtime, n_bytes=65536):
+    """Read only the last n_bytes of a log file (cached until it is modified)"""
+    with open(path, 'rb') as log_file:
+        size = os.fstat(log_file.fileno()).st_size
+        offset = max(0, size - n_bytes)
+        log_file.seek(offset)
+        data = log_file.read()
+    
+    # Drop the partial first line when starting mid-file
+    if offset:
+        data = data.partition(b'\n')[2]
+    
+    return data.decode('utf-8', errors='replace')
+
 def process_uploaded_file(uploaded_file):
     """Process an uploaded file through the multi-agent system"""
-    # Create a temporary file to save the uploaded content
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp_file:
-        tmp_file.write(uploaded_file.getbuffer())
+    # Stream the uploaded content into a temporary file in 1 MB chunks
+    suffix = os.path.splitext(uploaded_file.name)[1]
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        shutil.copyfileobj(uploaded_file, tmp_file, length=1 << 20)
         file_path = tmp_file.name
     
     try:
         # Process the file
-        result = st.session_state.system.process_document(file_path)
+        result = system.process_document(file_path)
         
         # Add to processed files list
         if result['status'] == 'success':
@@ -120,10 +158,9 @@ st.sidebar.header("Processing History")
 # Load processing results
 processing_results = load_processing_results()
 
-if processing_results:
-    # Convert to DataFrame for display
-    df = pd.DataFrame(processing_results)
-    df = df.rename(columns={
+if not processing_results.empty:
+    # Rename columns for display
+    df = processing_results.rename(columns={
         'thread_id': 'Thread ID',
         'input_source': 'Source',
         'timestamp': 'Time',
@@ -132,11 +169,13 @@ if processing_results:
         'status': 'Status'
     })
     
-    # Format the source path to show only filename
-    df['Source'] = df['Source'].apply(lambda x: os.path.basename(x))
+    # Show only the filename: stored at insert time, derived with vectorized
+    # string ops for rows written before display_name existed
+    basenames = df['Source'].str.rsplit('/', n=1).str[-1].str.rsplit('\\', n=1).str[-1]
+    df['Source'] = df['display_name'].fillna(basenames)
     
-    # Format timestamp
-    df['Time'] = pd.to_datetime(df['Time']).dt.strftime('%Y-%m-%d %H:%M:%S')
+    # Format timestamp (stored as ISO 8601, so slicing gives 'YYYY-MM-DD HH:MM:SS')
+    df['Time'] = df['Time'].str.slice(0, 19).str.replace('T', ' ', regex=False)
     
     # Display as a table
     st.sidebar.dataframe(df[['Source', 'Format', 'Intent', 'Status']], use_container_width=True)
@@ -216,7 +255,7 @@ with tab1:
                 history_data = []
                 for entry in routing_history:
                     history_data.append({
-                        'Time': pd.to_datetime(entry.get('timestamp')).strftime('%Y-%m-%d %H:%M:%S'),
+                        'Time': (entry.get('timestamp') or '')[:19].replace('T', ' '),
                         'From': entry.get('from_agent'),
                         'To': entry.get('to_agent'),
                         'Reason': entry.get('reason')
@@ -281,9 +320,8 @@ with tab3:
     st.subheader("System Logs")
     
     try:
-        with open("outputs/processing.log", "r") as log_file:
-            log_content = log_file.read()
-            st.text_area("Log Output", log_content, height=400)
+        log_content = _tail_log(LOG_PATH, os.path.getmtime(LOG_PATH))
+        st.text_area("Log Output", log_content, height=400)
     except FileNotFoundError:
         st.info("No log file found")
 
@@ -0,0 +1,71 @@
+"""
+Schema Compilation Script for Multi-Agent AI System
+Generates Python validator modules for the JSON agent's schemas ahead of time.
+"""
+
+import os
+import sys
+import argparse
+
+import fastjsonschema
+
+from agents.json_agent import JSONAgent, COMPILED_SCHEMAS_PACKAGE, schema_fingerprint
+
+def compile_schemas(schemas_dir=None, output_dir=None):
+    """
+    Write one validator module per schema into the compiled schemas package
+    
+    Args:
+        schemas_dir: Directory containing JSON schemas (default schemas if omitted)
+        output_dir: Directory to write the generated modules to
+        
+    Returns:
+        list: Paths of the generated modules
+    """
+    if output_dir is None:
+        output_dir = os.path.join(*COMPILED_SCHEMAS_PACKAGE.split('.'))
+    
+    os.makedirs(output_dir, exist_ok=True)
+    
+    init_path = os.path.join(output_dir, '__init__.py')
+    if not os.path.exists(init_path):
+        with open(init_path, 'w') as f:
+            f.write('"""Validators generated by compile_schemas.py. Do not edit."""\n')
+    
+    agent = JSONAgent(memory=None, schemas_dir=schemas_dir)
+    
+    generated = []
+    for schema_name, schema in agent.schemas.items():
+        if not schema_name.isidentifier():
+            print(f"Skipping schema {schema_name}: not a valid module name")
+            continue
+        
+        code = fastjsonschema.compile_to_code(schema)
+        module_path = os.path.join(output_dir, f"{schema_name}.py")
+        
+        with open(module_path, 'w') as f:
+            f.write(f'"""Validator for the {schema_name} schema, generated by compile_schemas.py. Do not edit."""\n\n')
+            f.write(f"SCHEMA_HASH = '{schema_fingerprint(schema)}'\n\n")
+            f.write(code if code.endswith('\n') else code + '\n')
+        
+        generated.append(module_path)
+    
+    return generated
+
+def main():
+    """Main entry point for schema compilation"""
+    parser = argparse.ArgumentParser(description="Precompile JSON schemas into validator modules")
+    parser.add_argument("--schemas", default=None, help="Directory containing JSON schemas (default schemas if omitted)")
+    parser.add_argument("--output", default=None, help="Directory to write the generated modules to")
+    
+    args = parser.parse_args()
+    
+    try:
+        for module_path in compile_schemas(args.schemas, args.output):
+            print(f"Generated {module_path}")
+    except Exception as e:
+        print(f"Error compiling schemas: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ import os
 import sys
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
@@ -86,11 +87,16 @@ class MultiAgentSystem:
             logger.info(f"Document classified as {format_type}, intent: {classification['intent']}")
             logger.info(f"Routing to {target_agent}")
             
-            # Step 2: Route to appropriate specialized agent
+            # Step 2: Route to appropriate specialized agent, handing over the
+            # content the classifier already parsed so the file is read only once
             if target_agent == "email_agent":
-                result = self.email_agent.process(thread_id, content)
+                result = self.email_agent.process(
+                    thread_id, content,
+                    intent=classification["intent"],
+                    received_date=classification["timestamp"]
+                )
             elif target_agent == "json_agent":
-                result = self.json_agent.process(thread_id, content)
+                result = self.json_agent.process(thread_id, content, intent=classification["intent"])
             else:
                 logger.error(f"Unknown target agent: {target_agent}")
                 return {"status": "error", "message": f"Unknown target agent: {target_agent}"}
@@ -114,12 +120,14 @@ class MultiAgentSystem:
             logger.exception(f"Error processing document: {e}")
             return {"status": "error", "message": str(e)}
     
-    def process_batch(self, directory_path: str) -> List[Dict[str, Any]]:
+    def process_batch(self, directory_path: str, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Process all documents in a directory
         
         Args:
             directory_path: Path to directory containing documents
+            max_workers: Number of documents processed concurrently
+                         (defaults to twice the CPU count, capped at 8)
             
         Returns:
             list: List of processing results
@@ -128,13 +136,18 @@ class MultiAgentSystem:
             logger.error(f"Directory not found: {directory_path}")
             return [{"status": "error", "message": f"Directory not found: {directory_path}"}]
         
-        results = []
+        with os.scandir(directory_path) as entries:
+            file_paths = [entry.path for entry in entries if entry.is_file()]
         
-        for filename in os.listdir(directory_path):
-            file_path = os.path.join(directory_path, filename)
-            if os.path.isfile(file_path):
-                result = self.process_document(file_path)
-                results.append(result)
+        if max_workers is None:
+            max_workers = min(8, (os.cpu_count() or 1) * 2)
+        
+        # Documents are independent and mostly I/O bound, so process them concurrently
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self.process_document, file_paths))
+        
+        # The workers have exited, so their database connections can be closed
+        self.memory.close_stale_connections()
         
         # Export final combined results
         self.memory.export_to_json("outputs/logs.json")
@@ -6,10 +6,51 @@ Provides a centralized memory store for all agents to log and retrieve informati
 import json
 import os
 import sqlite3
+import threading
 import uuid
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from typing import Dict, Any, List, Optional, Union
 
+def _to_json(value: Any) -> str:
+    """Serialize a value as compact JSON text, keeping non-ASCII characters as-is"""
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+def _thread_key(thread_id: str) -> bytes:
+    """Convert a thread ID to the 16-byte key it is stored under"""
+    return uuid.UUID(thread_id).bytes
+
+def _thread_id(key: Union[bytes, str]) -> str:
+    """Convert a stored thread key back to its canonical UUID string"""
+    if isinstance(key, bytes):
+        return str(uuid.UUID(bytes=key))
+    return key
+
+def _legacy_thread_key(value: Any) -> Any:
+    """Convert a thread ID stored as text by older versions, leaving other values untouched"""
+    try:
+        return _thread_key(value)
+    except (TypeError, ValueError, AttributeError):
+        return value
+
+def db_version(db_path: str) -> tuple:
+    """
+    Cheap change token for a SQLite database
+    
+    Every commit touches the database or its WAL file (writes land in the
+    WAL before they are checkpointed), so both files' modification times
+    and sizes change whenever anything is written.
+    """
+    version = []
+    for path in (db_path, db_path + '-wal'):
+        try:
+            stat = os.stat(path)
+            version.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            version.append(None)
+    return tuple(version)
+
 class SharedMemory:
     """
     A shared memory implementation using SQLite for persistent storage.
@@ -19,54 +60,130 @@ class SharedMemory:
     def __init__(self, db_path: str = "memory.db"):
         """Initialize the shared memory with SQLite backend"""
         self.db_path = db_path
+        
+        # One persistent connection per thread, and one writer at a time
+        self._local = threading.local()
+        self._connections = {}
+        self._connections_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        
         self._initialize_db()
     
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening and tuning it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            # page_size only takes effect on a new database, so it must come
+            # before journal_mode=WAL writes the first page
+            conn.execute("PRAGMA page_size=8192")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA wal_autocheckpoint=1000")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-20000")
+            
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections[threading.current_thread()] = conn
+            
+            # A new thread is a good moment to drop those that have gone away
+            self.close_stale_connections()
+        return conn
+    
+    def close_stale_connections(self):
+        """Close the connections of threads that have exited, such as finished pool workers"""
+        with self._connections_lock:
+            stale = [thread for thread in self._connections if not thread.is_alive()]
+            for thread in stale:
+                self._connections.pop(thread).close()
+    
+    def close(self):
+        """Close every connection opened by this memory instance"""
+        with self._connections_lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections = {}
+        self._local = threading.local()
+    
     def _initialize_db(self):
         """Create the necessary tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        conn = self._conn()
+        
+        # Create all tables and indexes in a single transaction
+        conn.executescript('''
+        BEGIN;
         
-        # Create main memory table
-        cursor.execute('''
+        -- Main memory table
         CREATE TABLE IF NOT EXISTS memory (
-            thread_id TEXT PRIMARY KEY,
+            thread_id BLOB PRIMARY KEY,
             input_source TEXT,
             timestamp TEXT,
             format TEXT,
             intent TEXT,
             status TEXT,
-            metadata TEXT
-        )
-        ''')
+            metadata TEXT,
+            display_name TEXT
+        );
         
-        # Create table for extracted fields
-        cursor.execute('''
+        -- Extracted fields
         CREATE TABLE IF NOT EXISTS extracted_fields (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            thread_id TEXT,
+            thread_id BLOB,
             field_name TEXT,
             field_value TEXT,
             FOREIGN KEY (thread_id) REFERENCES memory (thread_id)
-        )
-        ''')
+        );
         
-        # Create table for agent routing logs
-        cursor.execute('''
+        -- Agent routing logs
         CREATE TABLE IF NOT EXISTS routing_log (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            thread_id TEXT,
+            thread_id BLOB,
             timestamp TEXT,
             from_agent TEXT,
             to_agent TEXT,
             reason TEXT,
             FOREIGN KEY (thread_id) REFERENCES memory (thread_id)
-        )
+        );
+        
+        -- Index child tables on thread_id so per-thread lookups avoid full scans
+        CREATE INDEX IF NOT EXISTS idx_ef_thread ON extracted_fields (thread_id);
+        CREATE INDEX IF NOT EXISTS idx_rl_thread ON routing_log (thread_id, timestamp);
+        
+        -- Index the columns the reporting queries group and filter on
+        CREATE INDEX IF NOT EXISTS idx_memory_format ON memory (format);
+        CREATE INDEX IF NOT EXISTS idx_memory_intent ON memory (intent);
+        CREATE INDEX IF NOT EXISTS idx_memory_timestamp ON memory (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_rl_to_agent ON routing_log (to_agent);
+        
+        COMMIT;
         ''')
         
-        conn.commit()
-        conn.close()
+        # Databases created before display_name existed need the column added
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(memory)")}
+        if 'display_name' not in columns:
+            conn.execute("ALTER TABLE memory ADD COLUMN display_name TEXT")
+        
+        # Older versions stored thread IDs as 36-character UUID strings
+        if conn.execute("SELECT 1 FROM memory WHERE typeof(thread_id) = 'text' LIMIT 1").fetchone():
+            self._migrate_thread_keys(conn)
     
-    def create_thread(self, input_source: str, format_type: str, intent: str) -> str:
+    def _migrate_thread_keys(self, conn: sqlite3.Connection):
+        """Rewrite text thread IDs in every table as 16-byte blob keys"""
+        conn.create_function('thread_key', 1, _legacy_thread_key, deterministic=True)
+        conn.executescript('''
+        BEGIN;
+        UPDATE memory SET thread_id = thread_key(thread_id) WHERE typeof(thread_id) = 'text';
+        UPDATE extracted_fields SET thread_id = thread_key(thread_id) WHERE typeof(thread_id) = 'text';
+        UPDATE routing_log SET thread_id = thread_key(thread_id) WHERE typeof(thread_id) = 'text';
+        COMMIT;
+        ''')
+    
+    def create_thread(self, input_source: str, format_type: str, intent: str,
+                      timestamp: Optional[str] = None,
+                      metadata: Optional[Dict[str, Any]] = None) -> str:
         """
         Create a new memory thread for a document
         
@@ -74,102 +191,104 @@ class SharedMemory:
             input_source: Path or identifier of the input document
             format_type: Detected format (PDF, JSON, Email)
             intent: Detected intent (Invoice, RFQ, etc.)
+            timestamp: ISO creation time of the thread (defaults to now)
+            metadata: Initial thread metadata, stored with the row instead
+                      of in a separate update_metadata call
             
         Returns:
             thread_id: Unique identifier for this processing thread
         """
-        thread_id = str(uuid.uuid4())
-        timestamp = datetime.now().isoformat()
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "INSERT INTO memory VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (thread_id, input_source, timestamp, format_type, intent, "started", "{}")
-        )
-        
-        conn.commit()
-        conn.close()
-        
-        return thread_id
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
+        
+        with self._write_lock:
+            # RETURNING hands back the stored key without a follow-up SELECT
+            row = self._conn().execute(
+                "INSERT INTO memory (thread_id, input_source, timestamp, format, intent, status, metadata, display_name) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) RETURNING thread_id",
+                (uuid.uuid4().bytes, input_source, timestamp, format_type, intent, "started",
+                 _to_json(metadata or {}), os.path.basename(input_source))
+            ).fetchone()
+        
+        return _thread_id(row['thread_id'])
     
     def log_routing(self, thread_id: str, from_agent: str, to_agent: str, reason: str):
         """Log an agent routing event"""
         timestamp = datetime.now().isoformat()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "INSERT INTO routing_log (thread_id, timestamp, from_agent, to_agent, reason) VALUES (?, ?, ?, ?, ?)",
-            (thread_id, timestamp, from_agent, to_agent, reason)
-        )
-        
-        conn.commit()
-        conn.close()
+        with self._write_lock:
+            self._conn().execute(
+                "INSERT INTO routing_log (thread_id, timestamp, from_agent, to_agent, reason) VALUES (?, ?, ?, ?, ?)",
+                (_thread_key(thread_id), timestamp, from_agent, to_agent, reason)
+            )
     
     def store_extracted_field(self, thread_id: str, field_name: str, field_value: Any):
         """Store an extracted field from a document"""
-        # Convert non-string values to JSON
-        if not isinstance(field_value, str):
-            field_value = json.dumps(field_value)
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "INSERT INTO extracted_fields (thread_id, field_name, field_value) VALUES (?, ?, ?)",
-            (thread_id, field_name, field_value)
-        )
-        
-        conn.commit()
-        conn.close()
+        self.store_extracted_fields(thread_id, {field_name: field_value})
+    
+    def store_extracted_fields(self, thread_id: str, fields: Dict[str, Any]):
+        """Store several extracted fields from a document in a single transaction"""
+        # Convert non-string values to compact JSON
+        key = _thread_key(thread_id)
+        rows = [
+            (key, field_name,
+             field_value if isinstance(field_value, str) else _to_json(field_value))
+            for field_name, field_value in fields.items()
+        ]
+        
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT INTO extracted_fields (thread_id, field_name, field_value) VALUES (?, ?, ?)",
+                    rows
+                )
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
     
     def update_status(self, thread_id: str, status: str):
         """Update the processing status of a thread"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "UPDATE memory SET status = ? WHERE thread_id = ?",
-            (status, thread_id)
-        )
-        
-        conn.commit()
-        conn.close()
+        with self._write_lock:
+            self._conn().execute(
+                "UPDATE memory SET status = ? WHERE thread_id = ?",
+                (status, _thread_key(thread_id))
+            )
     
     def update_metadata(self, thread_id: str, metadata: Dict[str, Any]):
         """Update the metadata for a thread"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "UPDATE memory SET metadata = ? WHERE thread_id = ?",
-            (json.dumps(metadata), thread_id)
-        )
-        
-        conn.commit()
-        conn.close()
+        with self._write_lock:
+            self._conn().execute(
+                "UPDATE memory SET metadata = ? WHERE thread_id = ?",
+                (_to_json(metadata), _thread_key(thread_id))
+            )
     
     def get_thread_info(self, thread_id: str) -> Dict[str, Any]:
         """Get all information about a thread"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
+        key = _thread_key(thread_id)
         
         # Get main thread info
-        cursor.execute("SELECT * FROM memory WHERE thread_id = ?", (thread_id,))
+        cursor.execute("SELECT * FROM memory WHERE thread_id = ?", (key,))
         thread_data = dict(cursor.fetchone())
         
         # Get extracted fields
-        cursor.execute("SELECT field_name, field_value FROM extracted_fields WHERE thread_id = ?", (thread_id,))
+        cursor.execute("SELECT field_name, field_value FROM extracted_fields WHERE thread_id = ?", (key,))
         fields = {row['field_name']: row['field_value'] for row in cursor.fetchall()}
         
         # Get routing logs
-        cursor.execute("SELECT timestamp, from_agent, to_agent, reason FROM routing_log WHERE thread_id = ?", (thread_id,))
+        cursor.execute("SELECT timestamp, from_agent, to_agent, reason FROM routing_log WHERE thread_id = ?", (key,))
         routing = [dict(row) for row in cursor.fetchall()]
         
+        return self._assemble_thread(thread_data, fields, routing)
+    
+    def _assemble_thread(self, thread_data: Dict[str, Any], fields: Dict[str, str],
+                         routing: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine a memory row with its extracted fields and routing history"""
+        thread_data['thread_id'] = _thread_id(thread_data['thread_id'])
+        
         # Parse metadata
         if 'metadata' in thread_data and thread_data['metadata']:
             thread_data['metadata'] = json.loads(thread_data['metadata'])
@@ -178,32 +297,67 @@ class SharedMemory:
         thread_data['extracted_fields'] = fields
         thread_data['routing_history'] = routing
         
-        conn.close()
         return thread_data
     
     def export_to_json(self, output_path: str = "outputs/logs.json"):
-        """Export all memory data to a JSON file"""
+        """Export all memory data to a JSON file, streaming one thread at a time"""
         # Ensure the output directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Get all threads
-        cursor.execute("SELECT thread_id FROM memory")
-        thread_ids = [row['thread_id'] for row in cursor.fetchall()]
-        
-        # Get complete info for each thread
-        threads_data = [self.get_thread_info(thread_id) for thread_id in thread_ids]
-        
-        conn.close()
-        
-        # Write to JSON file
-        with open(output_path, 'w') as f:
-            json.dump(threads_data, f, indent=2)
+        conn = self._conn()
+        
+        # Read all three tables from one snapshot
+        conn.execute("BEGIN")
+        try:
+            # Each table is walked in thread_id order (served by its index) and
+            # merged, so only one thread's rows are held in memory at a time
+            threads = conn.execute("SELECT * FROM memory ORDER BY thread_id")
+            fields = self._group_by_thread(conn.execute(
+                "SELECT thread_id, field_name, field_value FROM extracted_fields ORDER BY thread_id, id"
+            ))
+            routing = self._group_by_thread(conn.execute(
+                "SELECT thread_id, timestamp, from_agent, to_agent, reason FROM routing_log ORDER BY thread_id, timestamp"
+            ))
+            next_fields = next(fields, None)
+            next_routing = next(routing, None)
+            
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write('[')
+                for index, row in enumerate(threads):
+                    key = row['thread_id']
+                    
+                    # Skip child rows of threads missing from memory
+                    while next_fields is not None and next_fields[0] < key:
+                        next_fields = next(fields, None)
+                    while next_routing is not None and next_routing[0] < key:
+                        next_routing = next(routing, None)
+                    
+                    thread_fields = {}
+                    if next_fields is not None and next_fields[0] == key:
+                        thread_fields = {r['field_name']: r['field_value'] for r in next_fields[1]}
+                        next_fields = next(fields, None)
+                    
+                    thread_routing = []
+                    if next_routing is not None and next_routing[0] == key:
+                        thread_routing = [
+                            {column: r[column] for column in ('timestamp', 'from_agent', 'to_agent', 'reason')}
+                            for r in next_routing[1]
+                        ]
+                        next_routing = next(routing, None)
+                    
+                    thread_data = self._assemble_thread(dict(row), thread_fields, thread_routing)
+                    f.write(',\n' if index else '\n')
+                    f.write(_to_json(thread_data))
+                f.write('\n]\n')
+        finally:
+            conn.execute("COMMIT")
         
         return output_path
+    
+    def _group_by_thread(self, cursor: sqlite3.Cursor):
+        """Yield (thread_id, rows) for a cursor ordered by thread_id"""
+        for thread_id, rows in groupby(cursor, key=itemgetter('thread_id')):
+            yield thread_id, list(rows)
 
 
 # Alternative Redis implementation (commented out)
@@ -5,7 +5,6 @@ Runs a demonstration of the system by processing all sample files and generating
 
 import os
 import sys
-import time
 import logging
 from main import MultiAgentSystem
 from utils.visualization import generate_processing_report
@@ -31,12 +30,8 @@ def run_demo():
     
     # Get all sample files
     input_dir = "inputs"
-    sample_files = []
-    
-    for filename in os.listdir(input_dir):
-        file_path = os.path.join(input_dir, filename)
-        if os.path.isfile(file_path):
-            sample_files.append(file_path)
+    with os.scandir(input_dir) as entries:
+        sample_files = [entry.path for entry in entries if entry.is_file()]
     
     logger.info(f"Found {len(sample_files)} sample files: {', '.join(os.path.basename(f) for f in sample_files)}")
     
@@ -45,9 +40,6 @@ def run_demo():
     for file_path in sample_files:
         logger.info(f"Processing file: {os.path.basename(file_path)}")
         
-        # Add a delay for demonstration purposes
-        time.sleep(1)
-        
         try:
             result = system.process_document(file_path)
             results.append(result)
@@ -56,8 +48,7 @@ def run_demo():
                 logger.info(f"Successfully processed as {result['format']} with intent {result['intent']}")
                 
                 # Print some extracted fields for demonstration
-                thread_info = system.memory.get_thread_info(result['thread_id'])
-                extracted_fields = thread_info.get('extracted_fields', {})
+                extracted_fields = result['processing_result'].get('extracted_fields', {})
                 
                 if extracted_fields:
                     logger.info("Extracted fields:")
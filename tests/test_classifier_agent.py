@@ -0,0 +1,48 @@
+"""
+Tests for the Classifier Agent
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory.shared_memory import SharedMemory
+from agents.classifier_agent import ClassifierAgent
+
+def _make_agent(tmp_path):
+    """Create a classifier agent backed by a fresh memory database"""
+    memory = SharedMemory(str(tmp_path / "memory.db"))
+    return memory, ClassifierAgent(memory)
+
+def test_cached_content_is_not_shared_between_calls(tmp_path):
+    """Modifying one result's content does not change later results for the same file"""
+    memory, agent = _make_agent(tmp_path)
+    path = tmp_path / "invoice.json"
+    path.write_text('{"type": "invoice", "items": [{"amount": 10}]}')
+
+    first = agent.process(str(path))
+    first['content']['items'].append({"amount": 99})
+    second = agent.process(str(path))
+
+    assert second['content'] is not first['content']
+    assert second['content'] == {"type": "invoice", "items": [{"amount": 10}]}
+    memory.close()
+
+def test_process_many_matches_process(tmp_path):
+    """Classifying in worker processes gives the same results, in input order"""
+    memory, agent = _make_agent(tmp_path)
+    invoice = tmp_path / "invoice.json"
+    invoice.write_text('{"type": "invoice", "invoice_number": "INV-1"}')
+    email = tmp_path / "complaint.eml"
+    email.write_text("From: a@example.com\nTo: b@example.com\nSubject: Complaint\n\nI am unhappy with this issue.\n")
+    paths = [str(email), str(invoice)]
+
+    results = agent.process_many(paths, workers=2)
+
+    assert [result['status'] for result in results] == ['success', 'success']
+    for result, path in zip(results, paths):
+        expected = agent.process(path)
+        assert (result['format'], result['intent'], result['content']) == \
+            (expected['format'], expected['intent'], expected['content'])
+    memory.close()
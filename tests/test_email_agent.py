@@ -0,0 +1,42 @@
+"""
+Tests for the Email Agent
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory.shared_memory import SharedMemory
+from agents.email_agent import EmailAgent
+
+def _make_agent(tmp_path):
+    """Create an email agent backed by a fresh memory database"""
+    memory = SharedMemory(str(tmp_path / "memory.db"))
+    return memory, EmailAgent(memory)
+
+def test_overlapping_amounts_are_all_extracted(tmp_path):
+    """An amount with both a symbol and a currency code yields both matches"""
+    memory, agent = _make_agent(tmp_path)
+
+    contacts, dates, amounts = agent._scan_body("Price: $1,000.00 USD")
+
+    assert amounts == ['$1,000.00', '1,000.00 USD']
+    memory.close()
+
+def test_amount_is_not_consumed_by_phone_number(tmp_path):
+    """A ten-digit amount is reported as an amount even though it looks like a phone number"""
+    memory, agent = _make_agent(tmp_path)
+    thread_id = memory.create_thread("quote.eml", "email", "rfq")
+    email_content = {
+        'from': 'buyer@example.com',
+        'subject': 'Quote',
+        'body': 'Total 1000000000 dollars',
+        'date': ''
+    }
+
+    result = agent.process(thread_id, email_content, "rfq", "")
+
+    assert result['extracted_fields']['amounts'] == ['1000000000 dollars']
+    assert result['crm_normalized']['business']['potential_value'] is not None
+    memory.close()
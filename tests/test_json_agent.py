@@ -0,0 +1,83 @@
+"""
+Tests for the JSON Agent
+"""
+
+import math
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory.shared_memory import SharedMemory
+from agents.json_agent import JSONAgent
+from utils.intent_detection import detect_intent_from_json
+
+def _make_agent(tmp_path):
+    """Create a JSON agent backed by a fresh memory database"""
+    memory = SharedMemory(str(tmp_path / "memory.db"))
+    return memory, JSONAgent(memory)
+
+def test_top_level_array_reports_missing_fields(tmp_path):
+    """A JSON array is processed as an invalid document, not an error"""
+    memory, agent = _make_agent(tmp_path)
+    thread_id = memory.create_thread("items.json", "json", "invoice")
+
+    result = agent.process(thread_id, [1, 2, 3], "invoice")
+
+    assert result['status'] == 'success'
+    assert result['validation']['valid'] is False
+    assert result['extracted_fields'] == {}
+    assert result['data_quality']['missing_fields'] == agent.schemas['invoice']['required']
+    assert result['data_quality']['anomalous_fields'] == []
+    memory.close()
+
+def test_top_level_array_of_field_names(tmp_path):
+    """Strings in an array are not mistaken for present fields"""
+    memory, agent = _make_agent(tmp_path)
+    thread_id = memory.create_thread("items.json", "json", "invoice")
+
+    result = agent.process(thread_id, ["invoice_number"], "invoice")
+
+    assert result['status'] == 'success'
+    assert 'invoice_number' in result['data_quality']['missing_fields']
+    memory.close()
+
+def test_intent_of_top_level_array_is_unknown():
+    """Intent detection does not fail on a JSON array"""
+    assert detect_intent_from_json([{"type": "invoice"}]) == ("unknown", 0.0)
+
+def test_schema_file_with_dotted_name(tmp_path):
+    """A schema whose name is not a module name is compiled at startup"""
+    schemas_dir = tmp_path / "schemas"
+    schemas_dir.mkdir()
+    (schemas_dir / "po.v1.json").write_text('{"type": "object", "required": ["po_number"]}')
+    memory = SharedMemory(str(tmp_path / "memory.db"))
+
+    agent = JSONAgent(memory, str(schemas_dir))
+
+    assert "po.v1" in agent.schemas
+    memory.close()
+
+def test_nan_value_is_analyzed_as_a_number(tmp_path):
+    """A NaN amount is checked as a number, including on a cached repeat"""
+    memory, agent = _make_agent(tmp_path)
+    document = {"invoice_number": "INV-1", "date": "2024-01-01", "total_amount": float('nan')}
+
+    for _ in range(2):
+        thread_id = memory.create_thread("invoice.json", "json", "invoice")
+        result = agent.process(thread_id, dict(document), "invoice")
+
+        assert result['data_quality']['anomalous_fields'] == []
+        assert math.isnan(result['extracted_fields']['total_amount'])
+    memory.close()
+
+def test_nan_and_null_documents_are_cached_apart(tmp_path):
+    """A document with null is not served the analysis of one with NaN"""
+    memory, agent = _make_agent(tmp_path)
+    thread_id = memory.create_thread("invoice.json", "json", "invoice")
+    agent.process(thread_id, {"invoice_number": "INV-1", "date": "2024-01-01", "total_amount": float('nan')}, "invoice")
+
+    result = agent.process(thread_id, {"invoice_number": "INV-1", "date": "2024-01-01", "total_amount": None}, "invoice")
+
+    assert [field['field'] for field in result['data_quality']['anomalous_fields']] == ['total_amount']
+    memory.close()
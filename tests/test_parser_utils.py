@@ -0,0 +1,33 @@
+"""
+Tests for the parser utilities
+"""
+
+import math
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.parser_utils import parse_json_file
+
+def test_json_with_nan_and_infinity(tmp_path):
+    """NaN and Infinity literals parse as they do with the json module"""
+    path = tmp_path / "values.json"
+    path.write_text('{"ratio": NaN, "limit": Infinity, "floor": -Infinity}')
+
+    data = parse_json_file(str(path))
+
+    assert math.isnan(data['ratio'])
+    assert data['limit'] == math.inf
+    assert data['floor'] == -math.inf
+
+def test_json_with_integers_wider_than_64_bits(tmp_path):
+    """Large integer IDs keep their exact value instead of becoming floats"""
+    path = tmp_path / "ids.json"
+    path.write_text('{"id": 123456789012345678901234567890, "small": -9223372036854775809}')
+
+    data = parse_json_file(str(path))
+
+    assert data['id'] == 123456789012345678901234567890
+    assert data['small'] == -9223372036854775809
+    assert isinstance(data['id'], int)
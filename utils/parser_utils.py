@@ -4,11 +4,13 @@ Provides utilities for parsing different document formats.
 """
 
 import os
+import re
 import json
+import mmap
 import email
 from email import policy
 from email.parser import BytesParser, Parser
-from typing import Dict, Any, Tuple, Optional, Union, BinaryIO, TextIO
+from typing import Dict, Any, Tuple, Optional, Union, BinaryIO, TextIO, Iterator
 
 # PDF parsing utilities
 try:
@@ -18,10 +20,90 @@ try:
 except ImportError:
     PDF_SUPPORT = False
 
+# Fast JSON parsing (orjson is a C parser, several times faster than json)
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
+
+# Integers of 19 or more digits may not fit in 64 bits, and orjson would
+# silently turn them into floats
+_WIDE_INT_RE = re.compile(rb'[0-9]{19}')
+_WIDE_INT_TEXT_RE = re.compile(r'[0-9]{19}')
+
+def json_loads(data: Union[bytes, str, memoryview]) -> Any:
+    """
+    Parse JSON from bytes or text, using orjson when available
+    
+    Falls back to the json module for content orjson does not read the same
+    way: NaN/Infinity literals and integers wider than 64 bits.
+    
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON
+    """
+    if ORJSON_SUPPORT:
+        wide_int_re = _WIDE_INT_TEXT_RE if isinstance(data, str) else _WIDE_INT_RE
+        if wide_int_re.search(data) is None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # Retried with json, which also accepts NaN and Infinity
+                pass
+    
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+# Files at least this large are parsed straight from a memory map
+_MMAP_MIN_BYTES = 1 << 20
+
+def json_load_file(f: BinaryIO) -> Any:
+    """
+    Parse JSON from a file opened in binary mode
+    
+    With orjson, large files are memory-mapped and parsed in place, so the
+    content is only copied into a Python bytes object if the json fallback
+    is needed.
+    
+    Raises:
+        json.JSONDecodeError: If the content is not valid JSON
+    """
+    if ORJSON_SUPPORT and os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return json_loads(view)
+    return json_loads(f.read())
+
+def canonical_json(data: Any) -> bytes:
+    """
+    Serialize JSON data with sorted keys, so equal documents give equal bytes
+    
+    Raises:
+        TypeError: If the data is not JSON serializable
+    """
+    if ORJSON_SUPPORT:
+        canonical = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        # orjson writes NaN and Infinity as null; json keeps them apart from None
+        if b'null' not in canonical:
+            return canonical
+    return json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+# Leading bytes read to recognise a file format without parsing the whole file
+_SNIFF_BYTES = 4096
+
+def _looks_like_email(content: str) -> bool:
+    """Check for the headers every email in this system carries"""
+    return 'From:' in content and ('Subject:' in content or 'To:' in content)
+
 def detect_file_format(file_path: str) -> str:
     """
     Detect the format of a file based on extension and content
     
+    The leading bytes decide the common cases (PDF signature, a JSON file
+    opening with '{' or '[', email headers near the top); the whole file is
+    only read when they are inconclusive.
+    
     Args:
         file_path: Path to the file
         
@@ -33,23 +115,44 @@ def detect_file_format(file_path: str) -> str:
     
     if ext == '.pdf':
         return 'pdf'
-    elif ext == '.json':
-        # Validate JSON content
+    
+    with open(file_path, 'rb') as f:
+        head = f.read(_SNIFF_BYTES)
+    
+    # Check magic bytes
+    if head.startswith(b'%PDF-'):
+        return 'pdf'
+    
+    if ext == '.json':
+        # A JSON document opens with an object or array; it is fully parsed
+        # (and reported if malformed) by parse_json_file
+        if head.lstrip()[:1] in (b'{', b'['):
+            return 'json'
+        
+        # Otherwise validate the whole JSON content
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                json.load(f)
+            with open(file_path, 'rb') as f:
+                json_load_file(f)
             return 'json'
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, UnicodeDecodeError):
             pass
     elif ext in ('.eml', '.txt'):
-        # Try to parse as email
+        # Headers are at the top, so the leading bytes usually settle it
+        # (undecodable leading bytes fall through to the full check)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                if 'From:' in content and ('Subject:' in content or 'To:' in content):
-                    return 'email'
+            if _looks_like_email(head.decode('utf-8')):
+                return 'email'
         except UnicodeDecodeError:
             pass
+        
+        # Try to parse as email
+        if len(head) == _SNIFF_BYTES:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    if _looks_like_email(f.read()):
+                        return 'email'
+            except UnicodeDecodeError:
+                pass
     
     # If extension check failed, try content-based detection
     try:
@@ -65,7 +168,7 @@ def detect_file_format(file_path: str) -> str:
                     pass
             
             # Check for email format
-            if 'From:' in content and ('Subject:' in content or 'To:' in content):
+            if _looks_like_email(content):
                 return 'email'
     except UnicodeDecodeError:
         # Binary file, could be PDF
@@ -74,12 +177,14 @@ def detect_file_format(file_path: str) -> str:
     
     return 'unknown'
 
-def extract_text_from_pdf(file_path: str) -> str:
+def extract_text_from_pdf(file_path: str, max_chars: Optional[int] = None) -> str:
     """
     Extract text content from a PDF file
     
     Args:
         file_path: Path to the PDF file
+        max_chars: Stop reading further pages once this many characters
+                   have been extracted (None reads the whole document)
         
     Returns:
         str: Extracted text content
@@ -89,25 +194,36 @@ def extract_text_from_pdf(file_path: str) -> str:
     
     # Try PyMuPDF first (usually better performance)
     try:
-        text = ""
         with fitz.open(file_path) as doc:
-            for page in doc:
-                text += page.get_text()
-        return text
+            return _join_page_text((page.get_text() for page in doc), max_chars)
     except Exception as e:
         print(f"PyMuPDF extraction failed: {e}, trying pdfplumber...")
     
     # Fallback to pdfplumber
     try:
-        text = ""
         with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-        return text
+            return _join_page_text((page.extract_text() or "" for page in pdf.pages), max_chars)
     except Exception as e:
         print(f"PDF text extraction failed: {e}")
         return ""
 
+def _join_page_text(pages: Iterator[str], max_chars: Optional[int]) -> str:
+    """Join page texts in one pass, consuming pages only until max_chars is reached"""
+    parts = []
+    length = 0
+    
+    for text in pages:
+        parts.append(text)
+        length += len(text)
+        if max_chars is not None and length >= max_chars:
+            break
+    
+    return "".join(parts)
+
+# Header lines and the blank line ending the header block of plain-text emails
+_PLAIN_HEADER_RE = re.compile(r'^(From|To|Subject|Date):(.*)$', re.MULTILINE | re.IGNORECASE)
+_HEADER_END_RE = re.compile(r'\n[^\S\n]*(?=\n|$)')
+
 def parse_email(file_path: str) -> Dict[str, Any]:
     """
     Parse an email file (.eml or .txt) into structured data
@@ -160,28 +276,17 @@ def parse_email(file_path: str) -> Dict[str, Any]:
                 'body': content,
             }
             
-            # Extract headers from plain text
-            lines = content.split('\n')
-            body_start = 0
+            # Headers end at the first blank line after the first line
+            separator = _HEADER_END_RE.search(content)
+            header_block = content[:separator.start()] if separator else content
             
-            for i, line in enumerate(lines):
-                if line.startswith('From:'):
-                    email_data['from'] = line[5:].strip()
-                elif line.startswith('To:'):
-                    email_data['to'] = line[3:].strip()
-                elif line.startswith('Subject:'):
-                    email_data['subject'] = line[8:].strip()
-                elif line.startswith('Date:'):
-                    email_data['date'] = line[5:].strip()
-                
-                # Empty line usually marks the start of the body
-                if line.strip() == '' and i > 0:
-                    body_start = i + 1
-                    break
+            # Extract headers from plain text
+            for match in _PLAIN_HEADER_RE.finditer(header_block):
+                email_data[match.group(1).lower()] = match.group(2).strip()
             
             # Set body if headers were found
-            if body_start > 0:
-                email_data['body'] = '\n'.join(lines[body_start:])
+            if separator:
+                email_data['body'] = content[separator.end() + 1:]
             
             return email_data
     
@@ -207,8 +312,8 @@ def parse_json_file(file_path: str) -> Dict[str, Any]:
         dict: Parsed JSON data
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return json_load_file(f)
     except json.JSONDecodeError as e:
         print(f"JSON parsing failed: {e}")
         return {}
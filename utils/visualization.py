@@ -4,18 +4,93 @@ Provides functions to visualize processing results and statistics.
 """
 
 import os
+import pathlib
 import json
 import sqlite3
+import threading
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from datetime import datetime, timedelta
 import io
 import base64
+from functools import lru_cache
+
+from memory.shared_memory import db_version
+
+# One read-only connection per thread and database, reused across reports
+_connections = threading.local()
+
+def _read_connection(db_path):
+    """
+    Get this thread's read-only connection to a database, opening it on first use
+    
+    Connections are tied to the file's device and inode, so a database that
+    is replaced or recreated gets a fresh connection. A missing database
+    raises FileNotFoundError instead of being created.
+    """
+    connections = getattr(_connections, 'by_path', None)
+    if connections is None:
+        connections = _connections.by_path = {}
+    
+    stat = os.stat(db_path)
+    file_id = (stat.st_dev, stat.st_ino)
+    
+    cached = connections.get(db_path)
+    if cached is not None and cached[0] == file_id:
+        return cached[1]
+    if cached is not None:
+        cached[1].close()
+    
+    conn = sqlite3.connect(pathlib.Path(db_path).resolve().as_uri() + '?mode=ro', uri=True,
+                           check_same_thread=False, isolation_level=None)
+    connections[db_path] = (file_id, conn)
+    return conn
+
+@lru_cache(maxsize=32)
+def _query_processing_stats(db_path, db_version, since):
+    """
+    Run the statistics queries (cached per database version and timeline window)
+    
+    Args:
+        db_path: Path to the memory database
+        db_version: Change token from db_version(), only used as a cache key
+        since: ISO timestamp where the processing timeline starts
+        
+    Returns:
+        dict: Processing statistics
+    """
+    stats = {
+        'format_counts': {},
+        'intent_counts': {},
+        'timeline': {},
+        'agent_counts': {}
+    }
+    
+    conn = _read_connection(db_path)
+    
+    # Format, intent, timeline (last 7 days) and agent routing counts in one round trip
+    rows = conn.execute('''
+        SELECT 'format_counts', format, COUNT(*) FROM memory GROUP BY format
+        UNION ALL
+        SELECT 'intent_counts', intent, COUNT(*) FROM memory GROUP BY intent
+        UNION ALL
+        SELECT 'timeline', DATE(timestamp), COUNT(*) FROM memory WHERE timestamp > ? GROUP BY DATE(timestamp)
+        UNION ALL
+        SELECT 'agent_counts', to_agent, COUNT(*) FROM routing_log GROUP BY to_agent
+    ''', (since,))
+    
+    for bucket, key, count in rows:
+        stats[bucket][key] = count
+    
+    return stats
 
 def get_processing_stats(db_path="outputs/memory.db"):
     """
     Get statistics about processed documents
     
+    Results are reused until the database changes; the 7-day timeline
+    window moves forward once a minute.
+    
     Args:
         db_path: Path to the memory database
         
@@ -23,34 +98,13 @@ def get_processing_stats(db_path="outputs/memory.db"):
         dict: Processing statistics
     """
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Get format counts
-        cursor.execute("SELECT format, COUNT(*) FROM memory GROUP BY format")
-        format_counts = dict(cursor.fetchall())
+        # Processing timeline covers the last 7 days, to the minute
+        seven_days_ago = (datetime.now() - timedelta(days=7)).isoformat(timespec='minutes')
         
-        # Get intent counts
-        cursor.execute("SELECT intent, COUNT(*) FROM memory GROUP BY intent")
-        intent_counts = dict(cursor.fetchall())
+        stats = _query_processing_stats(db_path, db_version(db_path), seven_days_ago)
         
-        # Get processing timeline (last 7 days)
-        seven_days_ago = (datetime.now() - timedelta(days=7)).isoformat()
-        cursor.execute("SELECT DATE(timestamp) as date, COUNT(*) FROM memory WHERE timestamp > ? GROUP BY DATE(timestamp)", (seven_days_ago,))
-        timeline = dict(cursor.fetchall())
-        
-        # Get agent routing counts
-        cursor.execute("SELECT to_agent, COUNT(*) FROM routing_log GROUP BY to_agent")
-        agent_counts = dict(cursor.fetchall())
-        
-        conn.close()
-        
-        return {
-            'format_counts': format_counts,
-            'intent_counts': intent_counts,
-            'timeline': timeline,
-            'agent_counts': agent_counts
-        }
+        # Hand out copies so callers cannot modify the cached result
+        return {key: dict(counts) for key, counts in stats.items()}
     except Exception as e:
         print(f"Error getting processing stats: {e}")
         return {
@@ -60,6 +114,18 @@ def get_processing_stats(db_path="outputs/memory.db"):
             'agent_counts': {}
         }
 
+def _encode_figure(fig):
+    """
+    Render a figure as SVG and base64-encode it
+    
+    SVG keeps the charts as vectors, so no rasterization step is needed.
+    """
+    buf = io.BytesIO()
+    fig.savefig(buf, format='svg')
+    
+    # Convert to base64 (the output is pure ASCII)
+    return base64.b64encode(buf.getvalue()).decode('ascii')
+
 def plot_format_distribution(stats):
     """
     Generate a pie chart of document format distribution
@@ -68,26 +134,20 @@ def plot_format_distribution(stats):
         stats: Processing statistics from get_processing_stats()
         
     Returns:
-        str: Base64-encoded PNG image
+        str: Base64-encoded SVG image
     """
     format_counts = stats.get('format_counts', {})
     
     if not format_counts:
         return None
     
-    plt.figure(figsize=(8, 6))
-    plt.pie(format_counts.values(), labels=format_counts.keys(), autopct='%1.1f%%', startangle=90)
-    plt.axis('equal')
-    plt.title('Document Format Distribution')
+    fig = Figure(figsize=(8, 6))
+    ax = fig.add_subplot()
+    ax.pie(list(format_counts.values()), labels=list(format_counts.keys()), autopct='%1.1f%%', startangle=90)
+    ax.axis('equal')
+    ax.set_title('Document Format Distribution')
     
-    # Save to a bytes buffer
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png')
-    plt.close()
-    buf.seek(0)
-    
-    # Convert to base64
-    return base64.b64encode(buf.read()).decode('utf-8')
+    return _encode_figure(fig)
 
 def plot_intent_distribution(stats):
     """
@@ -97,29 +157,23 @@ def plot_intent_distribution(stats):
         stats: Processing statistics from get_processing_stats()
         
     Returns:
-        str: Base64-encoded PNG image
+        str: Base64-encoded SVG image
     """
     intent_counts = stats.get('intent_counts', {})
     
     if not intent_counts:
         return None
     
-    plt.figure(figsize=(10, 6))
-    plt.bar(intent_counts.keys(), intent_counts.values())
-    plt.title('Document Intent Distribution')
-    plt.xlabel('Intent')
-    plt.ylabel('Count')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    
-    # Save to a bytes buffer
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png')
-    plt.close()
-    buf.seek(0)
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    ax.bar(list(intent_counts.keys()), list(intent_counts.values()))
+    ax.set_title('Document Intent Distribution')
+    ax.set_xlabel('Intent')
+    ax.set_ylabel('Count')
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
     
-    # Convert to base64
-    return base64.b64encode(buf.read()).decode('utf-8')
+    return _encode_figure(fig)
 
 def plot_processing_timeline(stats):
     """
@@ -129,7 +183,7 @@ def plot_processing_timeline(stats):
         stats: Processing statistics from get_processing_stats()
         
     Returns:
-        str: Base64-encoded PNG image
+        str: Base64-encoded SVG image
     """
     timeline = stats.get('timeline', {})
     
@@ -140,22 +194,16 @@ def plot_processing_timeline(stats):
     dates = sorted(timeline.keys())
     counts = [timeline[date] for date in dates]
     
-    plt.figure(figsize=(10, 6))
-    plt.plot(dates, counts, marker='o')
-    plt.title('Document Processing Timeline')
-    plt.xlabel('Date')
-    plt.ylabel('Documents Processed')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    ax.plot(dates, counts, marker='o')
+    ax.set_title('Document Processing Timeline')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Documents Processed')
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
     
-    # Save to a bytes buffer
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png')
-    plt.close()
-    buf.seek(0)
-    
-    # Convert to base64
-    return base64.b64encode(buf.read()).decode('utf-8')
+    return _encode_figure(fig)
 
 def generate_processing_report(db_path="outputs/memory.db", output_path="outputs/report.html"):
     """
@@ -175,92 +223,89 @@ def generate_processing_report(db_path="outputs/memory.db", output_path="outputs
     intent_chart = plot_intent_distribution(stats)
     timeline_chart = plot_processing_timeline(stats)
     
-    # Create HTML report
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Multi-Agent AI System - Processing Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; }}
-            h1, h2 {{ color: #2c3e50; }}
-            .container {{ display: flex; flex-wrap: wrap; }}
-            .chart {{ margin: 10px; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }}
-            table {{ border-collapse: collapse; width: 100%; }}
-            th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-            th {{ background-color: #f2f2f2; }}
-        </style>
-    </head>
-    <body>
-        <h1>Multi-Agent AI System - Processing Report</h1>
-        <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        
-        <h2>Processing Statistics</h2>
-        <div class="container">
-    """
-    
-    # Add format distribution chart
-    if format_chart:
-        html += f"""
-            <div class="chart">
-                <h3>Document Format Distribution</h3>
-                <img src="data:image/png;base64,{format_chart}" alt="Format Distribution">
-                <table>
-                    <tr><th>Format</th><th>Count</th></tr>
-                    {''.join(f'<tr><td>{format}</td><td>{count}</td></tr>' for format, count in stats['format_counts'].items())}
-                </table>
-            </div>
-        """
-    
-    # Add intent distribution chart
-    if intent_chart:
-        html += f"""
-            <div class="chart">
-                <h3>Document Intent Distribution</h3>
-                <img src="data:image/png;base64,{intent_chart}" alt="Intent Distribution">
-                <table>
-                    <tr><th>Intent</th><th>Count</th></tr>
-                    {''.join(f'<tr><td>{intent}</td><td>{count}</td></tr>' for intent, count in stats['intent_counts'].items())}
-                </table>
-            </div>
-        """
-    
-    # Add timeline chart
-    if timeline_chart:
-        html += f"""
-            <div class="chart">
-                <h3>Processing Timeline</h3>
-                <img src="data:image/png;base64,{timeline_chart}" alt="Processing Timeline">
-                <table>
-                    <tr><th>Date</th><th>Count</th></tr>
-                    {''.join(f'<tr><td>{date}</td><td>{count}</td></tr>' for date, count in sorted(stats['timeline'].items()))}
-                </table>
-            </div>
-        """
-    
-    # Add agent routing stats
-    html += f"""
-            <div class="chart">
-                <h3>Agent Routing Statistics</h3>
-                <table>
-                    <tr><th>Agent</th><th>Count</th></tr>
-                    {''.join(f'<tr><td>{agent}</td><td>{count}</td></tr>' for agent, count in stats['agent_counts'].items())}
-                </table>
-            </div>
-        </div>
-    """
-    
-    # Close HTML
-    html += """
-    </body>
-    </html>
-    """
-    
     # Ensure output directory exists
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     
-    # Write HTML to file
     with open(output_path, 'w') as f:
-        f.write(html)
+        # Write the HTML report chunk by chunk instead of growing one string
+        f.write(f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Multi-Agent AI System - Processing Report</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 20px; }}
+                h1, h2 {{ color: #2c3e50; }}
+                .container {{ display: flex; flex-wrap: wrap; }}
+                .chart {{ margin: 10px; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }}
+                table {{ border-collapse: collapse; width: 100%; }}
+                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+                th {{ background-color: #f2f2f2; }}
+            </style>
+        </head>
+        <body>
+            <h1>Multi-Agent AI System - Processing Report</h1>
+            <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        
+            <h2>Processing Statistics</h2>
+            <div class="container">
+        """)
+        
+        # Add format distribution chart
+        if format_chart:
+            f.write(f"""
+                <div class="chart">
+                    <h3>Document Format Distribution</h3>
+                    <img src="data:image/svg+xml;base64,{format_chart}" alt="Format Distribution">
+                    <table>
+                        <tr><th>Format</th><th>Count</th></tr>
+                        {''.join(f'<tr><td>{format}</td><td>{count}</td></tr>' for format, count in stats['format_counts'].items())}
+                    </table>
+                </div>
+            """)
+        
+        # Add intent distribution chart
+        if intent_chart:
+            f.write(f"""
+                <div class="chart">
+                    <h3>Document Intent Distribution</h3>
+                    <img src="data:image/svg+xml;base64,{intent_chart}" alt="Intent Distribution">
+                    <table>
+                        <tr><th>Intent</th><th>Count</th></tr>
+                        {''.join(f'<tr><td>{intent}</td><td>{count}</td></tr>' for intent, count in stats['intent_counts'].items())}
+                    </table>
+                </div>
+            """)
+        
+        # Add timeline chart
+        if timeline_chart:
+            f.write(f"""
+                <div class="chart">
+                    <h3>Processing Timeline</h3>
+                    <img src="data:image/svg+xml;base64,{timeline_chart}" alt="Processing Timeline">
+                    <table>
+                        <tr><th>Date</th><th>Count</th></tr>
+                        {''.join(f'<tr><td>{date}</td><td>{count}</td></tr>' for date, count in sorted(stats['timeline'].items()))}
+                    </table>
+                </div>
+            """)
+        
+        # Add agent routing stats
+        f.write(f"""
+                <div class="chart">
+                    <h3>Agent Routing Statistics</h3>
+                    <table>
+                        <tr><th>Agent</th><th>Count</th></tr>
+                        {''.join(f'<tr><td>{agent}</td><td>{count}</td></tr>' for agent, count in stats['agent_counts'].items())}
+                    </table>
+                </div>
+            </div>
+        """)
+        
+        # Close HTML
+        f.write("""
+        </body>
+        </html>
+        """)
     
     return output_path